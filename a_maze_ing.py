@@ -24,12 +24,20 @@ def a_maze_ing(argv: list[str]) -> None:
         assert maze.output is not None
         regenerate = True
         while regenerate:
-            maze.generate()
-            maze.write()
-            path = PathFinder(maze.output)
-            path.save_path()
             vis = Visualizer()
-            vis.read(maze.output)
+            if maze.stream:
+                maze.write_stream()
+                vis.read(maze.output, mapped=True)
+                regenerate, maze.seed = vis.render()
+                continue
+            if maze.animate:
+                with vis.watch(maze) as observer:
+                    maze.generate(observer)
+            else:
+                maze.generate()
+            path = PathFinder.from_maze(maze).find_path()
+            maze.write(path)
+            vis.load(maze, path)
             regenerate, maze.seed = vis.render()
             maze.reset()
     except Exception as e:
@@ -0,0 +1,79 @@
+"""
+Hunt-and-Kill hunt phase benchmark
+
+Compares the legacy full-grid rescan against the incremental hunt cursor.
+Run from the repository root:
+
+    python3 -m benchmarks.bench_hak
+    python3 -m benchmarks.bench_hak --sizes 100 200 --legacy-max 200
+
+The legacy scan grows roughly with the fourth power of the side length,
+so it is skipped above ``--legacy-max`` (500 by default).
+"""
+
+from argparse import ArgumentParser
+from time import perf_counter
+from mazegen import MazeGenerator
+from mazegen.hak import hak
+
+
+def build(size: int, seed: int) -> MazeGenerator:
+    """Create a square, perfect maze ready for generation.
+
+    Args:
+        size: Width and height in cells.
+        seed: Random seed.
+
+    Returns:
+        Configured MazeGenerator with a fresh grid.
+    """
+    maze = MazeGenerator()
+    maze.width = size
+    maze.height = size
+    maze.entry = (0, 0)
+    maze.exit = (size - 1, size - 1)
+    maze.perfect = True
+    maze.seed = seed
+    maze.reset()
+    return maze
+
+
+def timed(size: int, seed: int, incremental: bool) -> float:
+    """Time a single hak() run.
+
+    Args:
+        size: Width and height in cells.
+        seed: Random seed.
+        incremental: Hunt mode passed to hak().
+
+    Returns:
+        Elapsed wall time in seconds.
+    """
+    maze = build(size, seed)
+    start = perf_counter()
+    hak(maze, incremental=incremental)
+    return perf_counter() - start
+
+
+def main() -> None:
+    """Parse arguments and print the comparison table."""
+    parser = ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[100, 500, 2000])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--legacy-max", type=int, default=500,
+                        help="skip the legacy scan above this size")
+    args = parser.parse_args()
+
+    print(f"{'size':>8} {'legacy (s)':>12} {'cursor (s)':>12} {'speedup':>9}")
+    for size in args.sizes:
+        new = timed(size, args.seed, True)
+        if size <= args.legacy_max:
+            old = timed(size, args.seed, False)
+            print(f"{size:>8} {old:>12.3f} {new:>12.3f} {old / new:>8.1f}x")
+        else:
+            print(f"{size:>8} {'-':>12} {new:>12.3f} {'-':>9}")
+
+
+if __name__ == "__main__":
+    main()
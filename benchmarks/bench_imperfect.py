@@ -0,0 +1,87 @@
+"""
+Imperfect pass benchmark
+
+Compares the pure-Python make_imperfect() scan against the vectorized
+NumPy pass on the same perfect maze. Run from the repository root:
+
+    python3 -m benchmarks.bench_imperfect
+    python3 -m benchmarks.bench_imperfect --sizes 300 1000
+
+The vectorized column is skipped when NumPy is not installed.
+"""
+
+from argparse import ArgumentParser
+from time import perf_counter
+from mazegen import MazeGenerator
+from mazegen.imperfect import HAS_NUMPY, make_imperfect
+from mazegen.mask_42 import make_p42_mask
+
+
+def build(size: int, seed: int) -> MazeGenerator:
+    """Generate a square, perfect maze on a compact grid.
+
+    Args:
+        size: Width and height in cells.
+        seed: Random seed.
+
+    Returns:
+        MazeGenerator holding the generated maze.
+    """
+    maze = MazeGenerator()
+    maze.width = size
+    maze.height = size
+    maze.entry = (0, 0)
+    maze.exit = (size - 1, size - 1)
+    maze.perfect = True
+    maze.seed = seed
+    maze.algorithm = "eller"
+    maze.compact = True
+    maze.reset()
+    maze.generate()
+    return maze
+
+
+def timed(maze: MazeGenerator, perfect: bytes, vectorized: bool) -> float:
+    """Time one make_imperfect() run on a fresh copy of the maze.
+
+    Args:
+        maze: Maze to run the pass on.
+        perfect: Cells of the perfect maze, restored before the run.
+        vectorized: Pass mode given to make_imperfect().
+
+    Returns:
+        Elapsed wall time in seconds.
+    """
+    maze.grid = bytearray(perfect)
+    blocked = make_p42_mask(maze)
+    start = perf_counter()
+    make_imperfect(maze, blocked, vectorized=vectorized)
+    return perf_counter() - start
+
+
+def main() -> None:
+    """Parse arguments and print the comparison table."""
+    parser = ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[100, 300, 1000])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'size':>8} {'cells':>10} {'scan (s)':>10} "
+          f"{'numpy (s)':>10} {'speedup':>9}")
+    for size in args.sizes:
+        maze = build(size, args.seed)
+        assert isinstance(maze.grid, bytearray)
+        perfect = bytes(maze.grid)
+        scan = timed(maze, perfect, False)
+        cells = f"{size * size:>10}"
+        if HAS_NUMPY:
+            fast = timed(maze, perfect, True)
+            print(f"{size:>8} {cells} {scan:>10.3f} {fast:>10.3f} "
+                  f"{scan / fast:>8.1f}x")
+        else:
+            print(f"{size:>8} {cells} {scan:>10.3f} {'-':>10} {'-':>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Batch generation throughput benchmark
+
+Times MazeGenerator.generate_many() for an increasing number of worker
+processes and reports mazes per second. Run from the repository root:
+
+    python3 -m benchmarks.bench_many
+    python3 -m benchmarks.bench_many --count 500 --size 50 --workers 1 2 4
+"""
+
+from argparse import ArgumentParser
+from os import cpu_count
+from time import perf_counter
+from mazegen import MazeGenerator
+
+
+def main() -> None:
+    """Parse arguments and print mazes per second for each worker count."""
+    parser = ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=200,
+                        help="mazes per run")
+    parser.add_argument("--size", type=int, default=40,
+                        help="width and height of each maze")
+    parser.add_argument("--algorithm", default="dfs")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        help="worker counts (default: 1 .. cpu count)")
+    args = parser.parse_args()
+
+    maze = MazeGenerator()
+    maze.width = args.size
+    maze.height = args.size
+    maze.entry = (0, 0)
+    maze.exit = (args.size - 1, args.size - 1)
+    maze.perfect = True
+    maze.algorithm = args.algorithm
+    workers = args.workers or list(range(1, (cpu_count() or 1) + 1))
+    seeds = range(args.count)
+
+    print(f"{'workers':>8} {'time (s)':>10} {'mazes/s':>10} {'speedup':>9}")
+    base = 0.0
+    for n in workers:
+        start = perf_counter()
+        maze.generate_many(seeds, workers=n)
+        elapsed = perf_counter() - start
+        rate = args.count / elapsed
+        base = base or rate
+        print(f"{n:>8} {elapsed:>10.3f} {rate:>10.1f} {rate / base:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
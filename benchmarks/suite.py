@@ -0,0 +1,289 @@
+"""
+Benchmark suite for generation, solving, serialization and rendering
+
+Times every stage of a_maze_ing.py over a grid of maze sizes and seeds and
+reports cells per second and peak RSS. Run from the repository root:
+
+    python3 -m benchmarks.suite --output bench.json
+    python3 -m benchmarks.suite --sizes 100 300 --seeds 1 2 --cases dfs hak
+    python3 -m benchmarks.suite --compare bench_baseline.json
+
+Cases:
+    dfs, hak     Perfect maze generation.
+    imperfect    make_imperfect() on a perfect dfs maze.
+    write        MazeGenerator.write() of an imperfect maze with its path.
+    load         PathFinder._load_maze() of that output file.
+    solve        PathFinder.find_path() on the loaded maze.
+    render       Visualizer.load() and the build of every wall line.
+
+Each (case, size, seed) runs in a fresh process, so its peak RSS is its
+own: setup included, since that is what the stage needs in a real run.
+``base_rss`` is the peak before the setup (interpreter and imports).
+The time is the best of ``--repeat`` runs; the summary takes the median
+over seeds. With ``--compare`` the summary is checked against a saved
+JSON baseline and the exit status is 1 if a case got slower, or grew its
+peak RSS, by more than ``--threshold``.
+"""
+
+from __future__ import annotations
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from json import dump, load
+from multiprocessing import get_context
+from pathlib import Path
+from platform import platform, python_version
+from random import Random
+from resource import RUSAGE_SELF, getrusage
+from statistics import median
+from sys import exit, platform as system
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, Callable
+from mazegen import MazeGenerator, Visualizer
+from mazegen.dfs import dfs
+from mazegen.hak import hak
+from mazegen.imperfect import make_imperfect
+from mazegen.mask_42 import checked_p42_mask
+from pathfinder import PathFinder
+
+CASES = ["dfs", "hak", "imperfect", "write", "load", "solve", "render"]
+
+Record = dict[str, Any]
+
+
+def build(size: int, seed: int, perfect: bool, compact: bool) -> MazeGenerator:
+    """Create a square maze with a fresh grid, not generated yet.
+
+    Args:
+        size: Width and height in cells.
+        seed: Random seed.
+        perfect: Perfect maze flag.
+        compact: Use the flat bytearray grid layout.
+
+    Returns:
+        Configured MazeGenerator.
+    """
+    maze = MazeGenerator()
+    maze.width = size
+    maze.height = size
+    maze.entry = (0, 0)
+    maze.exit = (size - 1, size - 1)
+    maze.perfect = perfect
+    maze.seed = seed
+    maze.compact = compact
+    maze.reset()
+    return maze
+
+
+def prepare(
+    case: str, size: int, seed: int, compact: bool, work: Path
+) -> Callable[[], object]:
+    """Set a case up and return the call to time.
+
+    Args:
+        case: Name of the case, one of CASES.
+        size: Width and height in cells.
+        seed: Random seed.
+        compact: Use the flat bytearray grid layout.
+        work: Directory for the output file.
+
+    Returns:
+        Function running the timed part of the case once.
+    """
+    if case in ("dfs", "hak"):
+        maze = build(size, seed, True, compact)
+        engine = dfs if case == "dfs" else hak
+        return lambda: engine(maze, Random(seed))
+    if case == "imperfect":
+        maze = build(size, seed, True, compact)
+        dfs(maze, Random(seed))
+        blocked = checked_p42_mask(maze)
+        return lambda: make_imperfect(maze, blocked, rng=Random(seed))
+
+    maze = build(size, seed, False, compact)
+    maze.output = str(work / "maze.txt")
+    maze.generate()
+    path = PathFinder.from_maze(maze).find_path()
+    if case == "write":
+        return lambda: maze.write(path)
+    if case == "render":
+        vis = Visualizer()
+
+        def render() -> None:
+            vis.load(maze, path)
+            for i in range(size * 2 + 1):
+                vis._glyph_row(i)
+
+        return render
+    maze.write(path)
+    finder = PathFinder(maze.output)
+    if case == "load":
+        return finder._load_maze
+    if case == "solve":
+        return finder.find_path
+    raise ValueError(f"Unknown case: {case}")
+
+
+def peak_rss() -> int:
+    """Peak resident set size of this process, in bytes."""
+    peak = getrusage(RUSAGE_SELF).ru_maxrss
+    return peak if system == "darwin" else peak * 1024
+
+
+def run_case(
+    case: str, size: int, seed: int, repeat: int, compact: bool
+) -> tuple[float, int, int]:
+    """Run one case in the current process, meant for a fresh worker.
+
+    The setup is redone before every run, since generation cases
+    consume their grid.
+
+    Args:
+        case: Name of the case, one of CASES.
+        size: Width and height in cells.
+        seed: Random seed.
+        repeat: Number of timed runs.
+        compact: Use the flat bytearray grid layout.
+
+    Returns:
+        Best time in seconds, peak RSS before the setup and peak RSS at
+        the end, in bytes.
+    """
+    base = peak_rss()
+    best = float("inf")
+    with TemporaryDirectory() as work:
+        for _ in range(repeat):
+            call = prepare(case, size, seed, compact, Path(work))
+            start = perf_counter()
+            call()
+            best = min(best, perf_counter() - start)
+    return best, base, peak_rss()
+
+
+def summarize(results: list[Record]) -> list[Record]:
+    """Median time and largest peak RSS over the seeds of each case and size.
+
+    Args:
+        results: One record per (case, size, seed).
+
+    Returns:
+        One record per (case, size), in run order.
+    """
+    groups: dict[tuple[str, int], list[Record]] = {}
+    for record in results:
+        groups.setdefault((record["case"], record["size"]), []).append(record)
+    summary = []
+    for (case, size), records in groups.items():
+        seconds = median(r["seconds"] for r in records)
+        summary.append({
+            "case": case,
+            "size": size,
+            "cells": size * size,
+            "seconds": seconds,
+            "cells_per_sec": size * size / seconds if seconds else 0.0,
+            "peak_rss": max(r["peak_rss"] for r in records),
+        })
+    return summary
+
+
+def compare(
+    summary: list[Record], baseline: list[Record], threshold: float
+) -> int:
+    """Print the summary against a baseline and count the regressions.
+
+    Args:
+        summary: Current summary.
+        baseline: Summary of the baseline run.
+        threshold: Allowed relative growth of time and peak RSS.
+
+    Returns:
+        Number of (case, size) rows flagged as regressions.
+    """
+    base = {(r["case"], r["size"]): r for r in baseline}
+    print(f"\n{'case':<10} {'size':>6} {'base (s)':>10} {'now (s)':>10} "
+          f"{'time':>7} {'rss':>7}")
+    regressions = 0
+    for record in summary:
+        old = base.get((record["case"], record["size"]))
+        if old is None:
+            continue
+        time_ratio = record["seconds"] / old["seconds"]
+        rss_ratio = record["peak_rss"] / old["peak_rss"]
+        flags = []
+        if time_ratio > 1 + threshold:
+            flags.append("SLOWER")
+        if rss_ratio > 1 + threshold:
+            flags.append("MORE RSS")
+        regressions += bool(flags)
+        print(f"{record['case']:<10} {record['size']:>6} "
+              f"{old['seconds']:>10.6f} {record['seconds']:>10.6f} "
+              f"{time_ratio:>6.2f}x {rss_ratio:>6.2f}x  {' '.join(flags)}")
+    return regressions
+
+
+def main() -> None:
+    """Parse arguments, run the suite and write or compare the results."""
+    parser = ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[50, 100, 200])
+    parser.add_argument("--seeds", type=int, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=CASES)
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="timed runs per case, the best is kept")
+    parser.add_argument("--compact", action="store_true",
+                        help="use the flat bytearray grid layout")
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--compare", help="baseline JSON to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown before flagging (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    print(f"{'case':<10} {'size':>6} {'seed':>6} {'time (s)':>10} "
+          f"{'cells/s':>12} {'peak RSS':>10}")
+    results: list[Record] = []
+    context = get_context("spawn")
+    for case in args.cases:
+        for size in args.sizes:
+            for seed in args.seeds:
+                with ProcessPoolExecutor(1, mp_context=context) as pool:
+                    seconds, base, rss = pool.submit(
+                        run_case, case, size, seed, args.repeat, args.compact
+                    ).result()
+                rate = size * size / seconds if seconds else 0.0
+                results.append({
+                    "case": case,
+                    "size": size,
+                    "seed": seed,
+                    "seconds": seconds,
+                    "cells_per_sec": rate,
+                    "base_rss": base,
+                    "peak_rss": rss,
+                })
+                print(f"{case:<10} {size:>6} {seed:>6} {seconds:>10.6f} "
+                      f"{rate:>12.0f} {rss / 2**20:>7.1f} MiB")
+
+    report = {
+        "python": python_version(),
+        "platform": platform(),
+        "compact": args.compact,
+        "repeat": args.repeat,
+        "results": results,
+        "summary": summarize(results),
+    }
+    if args.output:
+        with open(args.output, "w") as fp:
+            dump(report, fp, indent=2)
+    if args.compare:
+        with open(args.compare) as fp:
+            baseline = load(fp)
+        regressions = compare(report["summary"], baseline["summary"],
+                              args.threshold)
+        if regressions:
+            print(f"\n{regressions} regression(s) above "
+                  f"{args.threshold:.0%}")
+            exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+Result cache for generated and solved mazes.
+
+A maze is fully determined by its size, entry, exit, perfect flag,
+algorithm and seed, so generating it again gives the same grid and the
+same path. MazeCache keeps these results, keyed by a hash of the settings,
+in an in-memory LRU and optionally in a directory shared between runs or
+processes. Entries are stored in the .mzb binary format (two cells per
+byte plus the packed path), both in memory and on disk.
+
+Mazes without a seed are random and never cached.
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+from copy import copy
+from hashlib import sha256
+from os import PathLike, fdopen, replace, unlink, utime
+from pathlib import Path
+from tempfile import mkstemp
+from typing import Iterable, Union
+from pathfinder import PathFinder
+from mazegen import MazeGenerator
+from mazegen.grid import Grid, flatten, new_grid, store
+from mazegen.imperfect import HAS_NUMPY
+from mazegen.loader import MazeData
+from mazegen.mzb import encode_mzb, parse_mzb
+
+# Bump when a change to the engines alters the maze of a given seed, so
+# entries of older versions are not returned
+VERSION = 1
+
+
+class MazeCache:
+    """Cache generated grids and their solution paths."""
+
+    def __init__(
+        self,
+        directory: Union[str, PathLike[str], None] = None,
+        max_memory: int = 64 << 20,
+        max_disk: int = 1 << 30,
+    ) -> None:
+        """Create an empty cache.
+
+        Args:
+            directory: Directory of the on-disk store, created if needed.
+                None keeps entries in memory only.
+            max_memory: Size limit of the in-memory entries, in bytes.
+            max_disk: Size limit of the .mzb files in ``directory``, in
+                bytes. The least recently used files are removed first.
+        """
+        self.directory = Path(directory) if directory is not None else None
+        self.max_memory = max_memory
+        self.max_disk = max_disk
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_used = 0
+        # Bytes of .mzb files on disk, scanned once and then kept up to
+        # date by put() and _evict_disk()
+        self._disk_used = 0
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._disk_used = sum(size for _, size, _ in self._disk_files())
+
+    @staticmethod
+    def key(maze: MazeGenerator, strategy: str = "auto") -> str | None:
+        """Content address of a maze and its path.
+
+        Args:
+            maze: Configured maze.
+            strategy: find_path() strategy, part of the key since the
+                path may differ between strategies on imperfect mazes.
+
+        Returns:
+            Hex digest, or None when the maze has no seed.
+        """
+        if maze.seed is None:
+            return None
+        settings = (
+            VERSION,
+            maze.width,
+            maze.height,
+            tuple(maze.entry) if maze.entry is not None else None,
+            tuple(maze.exit) if maze.exit is not None else None,
+            bool(maze.perfect),
+            maze.algorithm or "dfs",
+            maze.seed,
+            maze.vectorized and HAS_NUMPY,
+            strategy,
+        )
+        return sha256(repr(settings).encode()).hexdigest()
+
+    def get(self, key: str) -> MazeData | None:
+        """Look an entry up in memory, then on disk.
+
+        Hits and misses are counted; a disk hit is also kept in memory.
+
+        Args:
+            key: Digest returned by key().
+
+        Returns:
+            Decoded entry (cells, path, ...), or None on a miss.
+        """
+        data = self._memory.get(key)
+        if data is not None:
+            self._memory.move_to_end(key)
+        elif self.directory is not None:
+            file = self.directory / f"{key}.mzb"
+            try:
+                data = file.read_bytes()
+                entry = parse_mzb(data)
+            except (OSError, ValueError):
+                data = None
+            else:
+                utime(file)
+                self.disk_hits += 1
+                self.hits += 1
+                self._remember(key, data)
+                return entry
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return parse_mzb(data)
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store an encoded entry in memory and on disk.
+
+        The file is written to a unique temporary name in the same
+        directory and renamed, so readers and writers in other processes
+        never see a partial entry.
+
+        Args:
+            key: Digest returned by key().
+            data: Entry in the .mzb format.
+        """
+        self._remember(key, data)
+        if self.directory is None:
+            return
+        file = self.directory / f"{key}.mzb"
+        try:
+            old_size = file.stat().st_size
+        except FileNotFoundError:
+            old_size = 0
+        fd, tmp = mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with fdopen(fd, "wb") as fp:
+                fp.write(data)
+            replace(tmp, file)
+        except BaseException:
+            unlink(tmp)
+            raise
+        self._disk_used += len(data) - old_size
+        if self._disk_used > self.max_disk:
+            self._evict_disk()
+
+    def solve(self, maze: MazeGenerator, strategy: str = "auto") -> str | None:
+        """Generate and solve a maze, or fetch both from the cache.
+
+        The grid is reset and filled in either way, as generate() does.
+
+        Args:
+            maze: Configured maze; its grid receives the result.
+            strategy: find_path() strategy.
+
+        Returns:
+            Path as string of directions (N, E, S, W) or None if no path
+            exists.
+        """
+        assert maze.width is not None
+        key = self.key(maze, strategy)
+        entry = self.get(key) if key is not None else None
+        maze.reset()
+        assert maze.grid is not None
+        if entry is not None:
+            store(maze.grid, entry["cells"], maze.width)
+            return entry["path"]
+        maze.generate()
+        path = PathFinder.from_maze(maze).find_path(strategy)
+        if key is not None:
+            self.put(key, self._encode(maze, flatten(maze.grid), path))
+        return path
+
+    def solve_many(
+        self,
+        maze: MazeGenerator,
+        seeds: Iterable[int],
+        strategy: str = "auto",
+        workers: int | None = None,
+    ) -> list[tuple[Grid, str | None]]:
+        """Generate and solve one maze per seed, cached.
+
+        Seeds found in the cache are decoded; the others are generated
+        together with MazeGenerator.generate_many(), then solved and
+        stored. Results are in seed order.
+
+        Args:
+            maze: Maze giving every setting but the seed.
+            seeds: Seeds to solve.
+            strategy: find_path() strategy.
+            workers: Processes used for the misses, see generate_many().
+
+        Returns:
+            (grid, path) per seed, the grid in the layout of ``maze``.
+        """
+        assert maze.width is not None
+        assert maze.height is not None
+        jobs = list(seeds)
+        found: dict[int, tuple[bytearray, str | None]] = {}
+        keys: dict[int, str] = {}
+        for seed in jobs:
+            if seed in found or seed in keys:
+                continue
+            one = copy(maze)
+            one.seed = seed
+            key = self.key(one, strategy)
+            assert key is not None
+            entry = self.get(key)
+            if entry is not None:
+                found[seed] = (entry["cells"], entry["path"])
+            else:
+                keys[seed] = key
+
+        missing = list(keys)
+        for seed, grid in zip(missing, maze.generate_many(missing, workers)):
+            one = copy(maze)
+            one.seed = seed
+            one.grid = grid
+            path = PathFinder.from_maze(one).find_path(strategy)
+            cells = flatten(grid)
+            self.put(keys[seed], self._encode(one, cells, path))
+            found[seed] = (cells, path)
+
+        results: list[tuple[Grid, str | None]] = []
+        for seed in jobs:
+            cells, path = found[seed]
+            grid = new_grid(maze.width, maze.height, maze.compact)
+            store(grid, cells, maze.width)
+            results.append((grid, path))
+        return results
+
+    @staticmethod
+    def _encode(
+        maze: MazeGenerator, cells: bytearray, path: str | None
+    ) -> bytes:
+        """Entry of a generated maze in the .mzb format."""
+        assert maze.width is not None
+        assert maze.height is not None
+        return encode_mzb(
+            cells,
+            maze.width,
+            maze.height,
+            maze.entry,
+            maze.exit,
+            algorithm=maze.algorithm,
+            perfect=maze.perfect,
+            path=path,
+        )
+
+    def _remember(self, key: str, data: bytes) -> None:
+        """Add an entry to the in-memory LRU and evict down to the limit."""
+        if len(data) > self.max_memory:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_used -= len(old)
+        self._memory[key] = data
+        self._memory_used += len(data)
+        while self._memory_used > self.max_memory:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_used -= len(evicted)
+
+    def _disk_files(self) -> list[tuple[float, int, Path]]:
+        """(mtime, size, path) of every .mzb file on disk, oldest first."""
+        assert self.directory is not None
+        files = []
+        for file in self.directory.glob("*.mzb"):
+            try:
+                info = file.stat()
+            except FileNotFoundError:
+                continue
+            files.append((info.st_mtime, info.st_size, file))
+        files.sort()
+        return files
+
+    def _evict_disk(self) -> None:
+        """Remove the least recently used files above max_disk.
+
+        Only called once the running total exceeds the limit. The files
+        are scanned again, so entries written by other processes count.
+        """
+        files = self._disk_files()
+        used = sum(size for _, size, _ in files)
+        for _, size, file in files:
+            if used <= self.max_disk:
+                break
+            file.unlink(missing_ok=True)
+            used -= size
+        self._disk_used = used
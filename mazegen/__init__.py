@@ -1,16 +1,35 @@
 __all__ = [
     "dfs",
     "hak",
+    "kruskal",
+    "prim",
+    "wilson",
+    "eller",
+    "aldous_broder",
     "MazeGenerator",
     "Graphics",
     "Visualizer",
     "make_p42_mask",
     "make_imperfect",
+    "write_maze",
+    "load_maze",
+    "MappedGrid",
+    "dfs_steps",
+    "hak_steps",
+    "GenState",
 ]
 
-from .dfs import dfs
-from .hak import hak
+from .dfs import dfs, dfs_steps
+from .hak import hak, hak_steps
+from .kruskal import kruskal
+from .prim import prim
+from .wilson import wilson
+from .eller import eller
+from .aldous_broder import aldous_broder
 from .mazegen import MazeGenerator
 from .visualizer import Graphics, Visualizer
 from .mask_42 import make_p42_mask
 from .imperfect import make_imperfect
+from .writer import write_maze
+from .loader import MappedGrid, load_maze
+from .state import GenState
@@ -0,0 +1,91 @@
+"""
+Maze generator using the Aldous-Broder algorithm.
+
+A random walk wanders over the grid from the entry and removes the wall to
+every cell it enters for the first time, until all cells are visited. Like
+Wilson's algorithm it produces a uniform spanning tree, but it needs the
+cover time of the walk, far more steps than there are cells, so it is by
+far the slowest engine on large grids.
+"""
+
+from __future__ import annotations
+from random import Random
+from typing import TYPE_CHECKING
+from .mask_42 import checked_p42_mask
+from .imperfect import make_imperfect
+from .grid import BATCH, Observer, flatten, notify, padded_mask, store
+
+if TYPE_CHECKING:
+    from .mazegen import MazeGenerator
+
+# Padded bitmap values
+OUTSIDE = 0
+INSIDE = 1
+CLOSED = 2
+
+
+def aldous_broder(
+    maze: MazeGenerator,
+    rng: Random | None = None,
+    observer: Observer | None = None,
+    batch: int = BATCH,
+) -> None:
+    """
+    Aldous-Broder algorithm used by the MazeGenerator class
+
+    :param maze: MazeGenerator class
+    :param rng: Random number generator, seeded from maze.seed if None
+    :param observer: Called with the carve events of every batch carves
+    :param batch: Number of carves per observer call
+    """
+    assert maze.entry is not None
+    assert maze.height is not None
+    assert maze.width is not None
+    assert maze.grid is not None
+
+    blocked = checked_p42_mask(maze)
+    if rng is None:
+        rng = Random(maze.seed)
+    random = rng.random
+    width = maze.width
+    height = maze.height
+    cells = flatten(maze.grid)
+
+    stride = width + 2
+    state = padded_mask(width, height, blocked, CLOSED)
+    ex, ey = maze.entry
+    i = (ex + 1) * stride + ey + 1
+    state[i] = INSIDE
+    left = state.count(OUTSIDE)
+    step = [-stride, 1, stride, -1]
+    cell_step = [-width, 1, width, -1]
+    wall = [~1, ~2, ~4, ~8]
+    opposite_wall = [~4, ~8, ~1, ~2]
+    carved: list[int] = []
+    log = None if observer is None else carved.append
+    countdown = batch
+    while left:
+        d = int(random() * 4)
+        n = i + step[d]
+        if state[n] == CLOSED:
+            continue
+        if state[n] == OUTSIDE:
+            state[n] = INSIDE
+            left -= 1
+            c = i - stride + 1 - 2 * (i // stride)
+            cells[c] &= wall[d]
+            cells[c + cell_step[d]] &= opposite_wall[d]
+            if log is not None:
+                log(c << 2 | d)
+                countdown -= 1
+                if not countdown:
+                    notify(observer, carved)
+                    countdown = batch
+        i = n
+    store(maze.grid, cells, width)
+    notify(observer, carved)
+
+    if not maze.perfect:
+        make_imperfect(
+            maze, blocked, rng=rng, observer=observer, batch=batch
+        )
@@ -5,20 +5,59 @@ Generates perfect mazes (no loops).
 """
 
 from __future__ import annotations
-from random import shuffle, seed
-from .mask_42 import make_p42_mask
-from .imperfect import make_imperfect
-from typing import TYPE_CHECKING
+from random import Random
+from .mask_42 import checked_p42_mask
+from .imperfect import finish_steps
+from .grid import BATCH, Observer, flatten, padded_mask
+from .state import GenState
+from typing import TYPE_CHECKING, Iterator
 
 if TYPE_CHECKING:
     from .mazegen import MazeGenerator
 
 
-def dfs(maze: MazeGenerator) -> None:
+def dfs(
+    maze: MazeGenerator,
+    rng: Random | None = None,
+    observer: Observer | None = None,
+    batch: int = BATCH,
+) -> None:
     """
     Depth-first-search algorim used by the MazeGenerator class
 
     :param maze: MazeGenerator class
+    :param rng: Random number generator, seeded from maze.seed if None
+    :param observer: Called with the carve events of every batch carves
+    :param batch: Number of carves per observer call
+    """
+    every = batch if observer is not None else 0
+    for events in dfs_steps(maze, rng, every):
+        if observer is not None:
+            observer(events)
+
+
+def dfs_steps(
+    maze: MazeGenerator,
+    rng: Random | None = None,
+    every: int = BATCH,
+    state: GenState | None = None,
+) -> Iterator[list[int]]:
+    """
+    Depth-first search as a generator yielding every ``every`` carves
+
+    Each yield hands back the carve events of the last ``every`` carves
+    (see grid.Observer); with ``every`` 0 it runs to completion without
+    yielding. The grid is written when the generator is exhausted.
+
+    The stack, visited bitmap and random generator live in ``state``:
+    pass an empty GenState to be able to save() it between two steps, or
+    a loaded one to resume an interrupted generation.
+
+    :param maze: MazeGenerator class
+    :param rng: Random number generator, seeded from maze.seed if None;
+        a resumed generation continues from the saved generator state
+    :param every: Number of carves per step, 0 to never yield
+    :param state: Generation state, filled in when empty
     """
     assert maze.entry is not None
     assert maze.exit is not None
@@ -26,38 +65,80 @@ def dfs(maze: MazeGenerator) -> None:
     assert maze.width is not None
     assert maze.grid is not None
 
-    blocked = make_p42_mask(maze)
-    if blocked:
-        if maze.entry in blocked:
-            msg = f"Entry point {maze.entry} is inside the 42 (blocked) mask."
-            raise ValueError(msg)
-        if maze.exit in blocked:
-            msg = f"Exit point {maze.exit} is inside the 42 (blocked) mask."
-            raise ValueError(msg)
-    seed(maze.seed)
-    stack: list[tuple[int, int]] = [maze.entry]
-    visited: set[tuple[int, int]] = {maze.entry}
-    neighbors = [(-1, 0), (0, 1), (1, 0), (0, -1)]
-    opposite_wall = [2, 3, 0, 1]
-    dir = neighbors.copy()
+    blocked = checked_p42_mask(maze)
+    width = maze.width
+    height = maze.height
+    stride = width + 2
+    if state is None:
+        state = GenState()
+    if state.started:
+        state.check("dfs", width, height)
+        if rng is not None:
+            rng.setstate(state.rng.getstate())
+            state.rng = rng
+    else:
+        state.algorithm = "dfs"
+        state.width = width
+        state.height = height
+        state.rng = Random(maze.seed) if rng is None else rng
+        state.cells = flatten(maze.grid)
+
+        # Cells are tracked by linear index in a visited bitmap padded
+        # with a one cell border. The border and the 42 mask start out
+        # visited, so a single lookup rejects out of bounds, blocked and
+        # visited neighbors.
+        visited = padded_mask(width, height, blocked)
+
+        ex, ey = maze.entry
+        start = (ex + 1) * stride + ey + 1
+        visited[start] = 1
+        state.visited = visited
+        state.stack = [start]
+
+    shuffle = state.rng.shuffle
+    cells = state.cells
+    visited = state.visited
+    stack = state.stack
+    dir = state.order
+    step = [-stride, 1, stride, -1]
+    cell_step = [-width, 1, width, -1]
+    wall = [~1, ~2, ~4, ~8]
+    opposite_wall = [~4, ~8, ~1, ~2]
+    # Carve events of the current step are stored in place. Each pass of
+    # the bounded loop carves once, its index is the slot of the event,
+    # so a full step is the end of the loop. There are fewer carves than
+    # cells, so without steps it is never reached.
+    carved = [0] * every
+    limit = every or len(cells)
+    k = 0
     while stack:
-        x, y = stack[-1]
-        shuffle(dir)
-        moved = False
-        for dx, dy in dir:
-            if 0 <= x + dx < maze.height and 0 <= y + dy < maze.width:
-                if blocked and (x + dx, y + dy) in blocked:
+        for k in range(k, limit):
+            # Backtrack to the last cell with an unvisited neighbor
+            while stack:
+                i = stack[-1]
+                shuffle(dir)
+                for d in dir:
+                    n = i + step[d]
+                    if not visited[n]:
+                        break
+                else:
+                    stack.pop()
                     continue
-                if (x + dx, y + dy) not in visited:
-                    stack.append((x + dx, y + dy))
-                    visited.add((x + dx, y + dy))
-                    i = neighbors.index((dx, dy))
-                    maze.grid[x][y] &= ~(1 << i)
-                    maze.grid[x + dx][y + dy] &= ~(1 << opposite_wall[i])
-                    moved = True
-                    break
-        if not moved:
-            stack.pop()
-
-    if not maze.perfect:
-        make_imperfect(maze, blocked)
+                break
+            else:
+                break
+            visited[n] = 1
+            stack.append(n)
+            c = i - stride + 1 - 2 * (i // stride)
+            cells[c] &= wall[d]
+            cells[c + cell_step[d]] &= opposite_wall[d]
+            if every:
+                carved[k] = c << 2 | d
+        else:
+            yield carved[:]
+            k = 0
+            continue
+        break
+    if every and k:
+        yield carved[:k]
+    yield from finish_steps(maze, blocked, state, every)
@@ -0,0 +1,256 @@
+"""
+Maze generator using Eller's algorithm.
+
+The maze is built one row at a time and only the current row is kept:
+each open cell carries the label of the set of cells it is connected to.
+Adjacent cells of different sets are joined at random, then every set
+gets at least one passage down into the next row; the last row joins all
+remaining sets. A row is final as soon as its passages down are chosen,
+so rows can be written out while the next ones are generated.
+
+The 42 mask splits a row into segments of open cells. A segment is "live"
+if the maze can still go down from it to the last row; in the few rows
+around the mask a set that cannot reach a live cell is merged with its
+neighbors, and every dead segment of the next row gets a passage from
+above, so the maze stays connected.
+"""
+
+from __future__ import annotations
+from itertools import compress
+from random import Random
+from typing import TYPE_CHECKING, Iterator
+from .mask_42 import checked_p42_mask
+from .imperfect import imperfect_rows
+from .grid import BATCH, Observer, flatten, notify, store
+
+# Per cell value: 1 if the east (north) wall is open
+_EAST_OPEN = bytes(not v & 2 for v in range(256))
+_NORTH_OPEN = bytes(not v & 1 for v in range(256))
+
+if TYPE_CHECKING:
+    from .mazegen import MazeGenerator
+
+
+def _live_rows(
+    width: int, height: int, masked: dict[int, bytes]
+) -> dict[int, bytes]:
+    """
+    Live cells of the rows around the mask, other rows are all live
+
+    :param width: Number of columns
+    :param height: Number of rows
+    :param masked: Open cells of the rows with blocked cells
+    """
+    full = b"\x01" * width
+    live: dict[int, bytes] = {}
+    if not masked:
+        return live
+    for r in range(max(masked), max(min(masked) - 1, 0) - 1, -1):
+        row = masked.get(r, full)
+        if r == height - 1:
+            live[r] = row
+            continue
+        below = masked.get(r + 1, full)
+        below_live = live.get(r + 1, below)
+        out = bytearray(width)
+        c = 0
+        while c < width:
+            if not row[c]:
+                c += 1
+                continue
+            s = c
+            ok = False
+            while c < width and row[c]:
+                ok = ok or bool(below[c] and below_live[c])
+                c += 1
+            if ok:
+                out[s:c] = b"\x01" * (c - s)
+        live[r] = bytes(out)
+    return live
+
+
+def eller_rows(
+    width: int,
+    height: int,
+    rng: Random,
+    blocked: set[tuple[int, int]] | None = None,
+) -> Iterator[bytearray]:
+    """
+    Generate a maze with Eller's algorithm, one finished row at a time
+
+    Memory use is O(width), whatever the height.
+
+    :param width: Number of columns
+    :param height: Number of rows
+    :param rng: Random number generator
+    :param blocked: Blocked (row, col) cells, such as the 42 mask
+    """
+    random = rng.random
+    randrange = rng.randrange
+    full = b"\x01" * width
+    masked: dict[int, bytes] = {}
+    for bx, by in blocked or ():
+        row = bytearray(masked.get(bx, full))
+        row[by] = 0
+        masked[bx] = bytes(row)
+    live = _live_rows(width, height, masked)
+
+    first = masked.get(0, full)
+    labels = [c if first[c] else -1 for c in range(width)]
+    cur = bytearray(b"\x0f") * width
+    for r in range(height):
+        free = masked.get(r, full)
+        last = r == height - 1
+        parent = list(range(width))
+
+        def find(a: int) -> int:
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            return a
+
+        def join(c: int) -> None:
+            cur[c] &= ~2
+            cur[c + 1] &= ~8
+
+        for c in range(width - 1):
+            if free[c] and free[c + 1]:
+                a = find(labels[c])
+                b = find(labels[c + 1])
+                if a != b and (last or random() < 0.5):
+                    parent[a] = b
+                    join(c)
+        if last:
+            yield cur
+            return
+
+        below = masked.get(r + 1, full)
+        below_live = live.get(r + 1, below)
+        plain = r not in masked and r + 1 not in masked
+        down = full if plain else bytes(
+            1 if free[c] and below[c] and below_live[c] else 0
+            for c in range(width)
+        )
+        if not plain:
+            # Merge the sets that cannot go down with a neighbor set
+            alive = {find(labels[c]) for c in range(width) if down[c]}
+            changed = True
+            while changed:
+                changed = False
+                for c in range(width - 1):
+                    if free[c] and free[c + 1]:
+                        a = find(labels[c])
+                        b = find(labels[c + 1])
+                        if a != b and (a not in alive or b not in alive):
+                            parent[a] = b
+                            if a in alive:
+                                alive.add(b)
+                            join(c)
+                            changed = True
+
+        nxt = bytearray(b"\x0f") * width
+        above = [-1] * width
+
+        def connect(c: int) -> None:
+            cur[c] &= ~4
+            nxt[c] &= ~1
+            above[c] = find(labels[c])
+
+        groups: dict[int, list[int]] = {}
+        for c in range(width):
+            if down[c]:
+                groups.setdefault(find(labels[c]), []).append(c)
+        for cols in groups.values():
+            picks = [c for c in cols if random() < 0.5]
+            if not picks:
+                picks = [cols[randrange(len(cols))]]
+            for c in picks:
+                connect(c)
+        if not plain:
+            # Passages into dead cells are optional, but every dead
+            # segment of the next row needs at least one
+            for c in range(width):
+                if free[c] and below[c] and not down[c]:
+                    if random() < 0.5:
+                        connect(c)
+            c = 0
+            while c < width:
+                if not below[c] or below_live[c]:
+                    c += 1
+                    continue
+                s = c
+                while c < width and below[c] and not below_live[c]:
+                    c += 1
+                if all(above[k] < 0 for k in range(s, c)):
+                    options = [k for k in range(s, c) if free[k]]
+                    if options:
+                        connect(options[randrange(len(options))])
+
+        yield cur
+
+        # Label the next row: sets continued from above, new sets for
+        # the other open cells, renumbered to 0..width-1
+        ids: dict[int, int] = {}
+        labels = [
+            -1
+            if not below[c]
+            else ids.setdefault(
+                above[c] if above[c] >= 0 else width + c, len(ids)
+            )
+            for c in range(width)
+        ]
+        cur = nxt
+
+
+def eller(
+    maze: MazeGenerator,
+    rng: Random | None = None,
+    observer: Observer | None = None,
+    batch: int = BATCH,
+) -> None:
+    """
+    Eller algorithm used by the MazeGenerator class
+
+    The imperfect pass runs on the stream of rows (imperfect_rows()), so
+    the maze is the same as the one written by MazeGenerator.write_stream().
+
+    :param maze: MazeGenerator class
+    :param rng: Random number generator, seeded from maze.seed if None
+    :param observer: Called with the carve events of every batch carves
+    :param batch: Number of carves per observer call
+    """
+    assert maze.height is not None
+    assert maze.width is not None
+    assert maze.grid is not None
+
+    blocked = checked_p42_mask(maze)
+    if rng is None:
+        rng = Random(maze.seed)
+    width = maze.width
+    cells = flatten(maze.grid)
+    carved: list[int] = []
+
+    rows = eller_rows(width, maze.height, rng, blocked)
+    if not maze.perfect:
+        rows = imperfect_rows(rows, width, maze.height, blocked, rng)
+    for r, row in enumerate(rows):
+        cells[r * width:(r + 1) * width] = row
+        # Events are read off each finished row instead of being logged
+        # per carve: its open east walls, and its open north walls as
+        # the south walls of the row above. They are sent once per row,
+        # still in batches of batch.
+        if observer is not None:
+            base = r * width << 2
+            carved += compress(
+                range(base | 1, base + (width << 2), 4),
+                row.translate(_EAST_OPEN),
+            )
+            carved += compress(
+                range(base - (width << 2) | 2, base, 4),
+                row.translate(_NORTH_OPEN),
+            )
+            while len(carved) >= batch:
+                observer(carved[:batch])
+                del carved[:batch]
+    store(maze.grid, cells, width)
+    notify(observer, carved)
@@ -0,0 +1,140 @@
+"""
+Grid storage helpers.
+
+A maze grid is either the classic ``list[list[int]]`` indexed as
+``grid[row][col]`` or a compact ``bytearray`` of one cell per byte indexed
+as ``grid[row * width + col]``. The generators work on the flat layout and
+use these helpers to move between the two.
+"""
+
+from __future__ import annotations
+from typing import Callable, Iterator, Sequence, Union
+
+Grid = Union[list[list[int]], bytearray]
+# Called with a batch of carve events. An event is one int,
+# ``cell << 2 | d``: the wall ``1 << d`` (N, E, S, W for d = 0..3) of
+# cell ``cell`` (row-major index) and the facing wall of its neighbor
+# were removed. See apply_carves().
+Observer = Callable[[list[int]], None]
+# Carves per observer call
+BATCH = 256
+
+
+def new_grid(width: int, height: int, compact: bool = False) -> Grid:
+    """
+    Create a grid with every wall closed
+
+    :param width: Number of columns
+    :param height: Number of rows
+    :param compact: Return a flat bytearray instead of nested lists
+    """
+    if compact:
+        return bytearray(b"\x0f") * (width * height)
+    return [[15] * width for _ in range(height)]
+
+
+def flatten(grid: Grid) -> bytearray:
+    """
+    Return the cells of the grid in row-major order
+
+    A compact grid is returned as is (no copy), nested lists are copied.
+
+    :param grid: Grid in either layout
+    """
+    if isinstance(grid, bytearray):
+        return grid
+    cells = bytearray()
+    for row in grid:
+        cells.extend(row)
+    return cells
+
+
+def store(grid: Grid, cells: bytearray, width: int) -> None:
+    """
+    Copy flat cells back into the grid
+
+    Nothing is copied when ``cells`` already is the compact grid.
+
+    :param grid: Destination grid in either layout
+    :param cells: Cells in row-major order
+    :param width: Number of columns
+    """
+    if grid is cells:
+        return
+    if isinstance(grid, bytearray):
+        grid[:] = cells
+        return
+    for r, row in enumerate(grid):
+        row[:] = cells[r * width:(r + 1) * width]
+
+
+def rows(grid: Grid, width: int) -> Iterator[Sequence[int]]:
+    """
+    Iterate over the rows of the grid
+
+    :param grid: Grid in either layout
+    :param width: Number of columns
+    """
+    if isinstance(grid, bytearray):
+        view = memoryview(grid)
+        for start in range(0, len(grid), width):
+            yield view[start:start + width]
+    else:
+        yield from grid
+
+
+def padded_mask(
+    width: int,
+    height: int,
+    blocked: set[tuple[int, int]] | None,
+    value: int = 1,
+) -> bytearray:
+    """
+    Cell bitmap padded with a one cell border
+
+    Cell (row, col) is at ``(row + 1) * (width + 2) + col + 1``. The
+    border and the blocked cells are set to ``value``, every other cell
+    to 0, so a single lookup rejects out of bounds and blocked neighbors.
+
+    :param width: Number of columns
+    :param height: Number of rows
+    :param blocked: Blocked (row, col) cells, such as the 42 mask
+    :param value: Value of the border and blocked cells
+    """
+    stride = width + 2
+    padded = bytearray([value]) * (stride * (height + 2))
+    for x in range(height):
+        row = (x + 1) * stride + 1
+        padded[row:row + width] = bytes(width)
+    if blocked:
+        for bx, by in blocked:
+            padded[(bx + 1) * stride + by + 1] = value
+    return padded
+
+
+def notify(observer: Observer | None, carved: list[int]) -> None:
+    """
+    Send the carve events of a batch to the observer and clear the list
+
+    :param observer: Callback receiving the carve events, may be None
+    :param carved: Carve events since the last call
+    """
+    if observer is not None and carved:
+        observer(carved[:])
+        carved.clear()
+
+
+def apply_carves(cells: bytearray, width: int, events: list[int]) -> None:
+    """
+    Replay carve events on cells in row-major order
+
+    :param cells: Cells to update
+    :param width: Number of columns
+    :param events: Carve events received by an Observer
+    """
+    step = (-width, 1, width, -1)
+    for event in events:
+        c = event >> 2
+        d = event & 3
+        cells[c] &= ~(1 << d)
+        cells[c + step[d]] &= ~(1 << (d ^ 2))
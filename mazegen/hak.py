@@ -1,19 +1,75 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
-from random import seed, choice
-from .mask_42 import make_p42_mask
-from .imperfect import make_imperfect
+from typing import TYPE_CHECKING, Iterator
+from random import Random
+from .mask_42 import checked_p42_mask
+from .imperfect import finish_steps
+from .grid import BATCH, Observer, flatten, padded_mask
+from .state import GenState
 
 if TYPE_CHECKING:
     from .mazegen import MazeGenerator
 
+# Padded bitmap values
+VISITED = 1
+CLOSED = 2
 
-def hak(maze: MazeGenerator) -> None:
+
+def hak(
+    maze: MazeGenerator,
+    rng: Random | None = None,
+    incremental: bool = True,
+    observer: Observer | None = None,
+    batch: int = BATCH,
+) -> None:
     """
     Hunt-and-Kill maze generation algorithm using integer grid format.
 
     - Kill phase: random walk carving passages until stuck
     - Hunt phase: scan for an unvisited cell next to a visited one
+
+    With ``incremental`` the hunt resumes from a cursor on the first
+    unvisited cell and skips rows that have no unvisited cells left,
+    instead of rescanning the grid from (0, 0). Both modes pick the same
+    cell, so the maze is identical for a given seed.
+
+    :param maze: MazeGenerator class
+    :param rng: Random number generator, seeded from maze.seed if None
+    :param incremental: Use the cursor based hunt (default: True)
+    :param observer: Called with the carve events of every batch carves
+    :param batch: Number of carves per observer call
+    """
+    every = batch if observer is not None else 0
+    for events in hak_steps(maze, rng, every, incremental=incremental):
+        if observer is not None:
+            observer(events)
+
+
+def hak_steps(
+    maze: MazeGenerator,
+    rng: Random | None = None,
+    every: int = BATCH,
+    state: GenState | None = None,
+    incremental: bool = True,
+) -> Iterator[list[int]]:
+    """
+    Hunt-and-Kill as a generator yielding about every ``every`` carves
+
+    Each yield hands back the carve events since the previous one (see
+    grid.Observer). Steps end inside a kill phase or right after a hunt,
+    so a step can exceed ``every`` by the one carve of a hunt. With
+    ``every`` 0 it runs to completion without yielding. The grid is
+    written when the generator is exhausted.
+
+    The visited cells, hunt cursor, current cell and random generator
+    live in ``state``: pass an empty GenState to be able to save() it
+    between two steps, or a loaded one to resume.
+
+    :param maze: MazeGenerator class
+    :param rng: Random number generator, seeded from maze.seed if None;
+        a resumed generation continues from the saved generator state
+    :param every: Number of carves per step, 0 to never yield
+    :param state: Generation state, filled in when empty
+    :param incremental: Use the cursor based hunt (default: True)
     """
 
     assert maze.grid is not None
@@ -21,98 +77,165 @@ def hak(maze: MazeGenerator) -> None:
     assert maze.height is not None
     assert maze.entry is not None
 
-    seed(maze.seed)
-    blocked = make_p42_mask(maze)
-    if blocked:
-        if maze.entry in blocked:
-            msg = f"Entry point {maze.entry} is inside the 42 (blocked) mask."
-            raise ValueError(msg)
-        if maze.exit in blocked:
-            msg = f"Exit point {maze.exit} is inside the 42 (blocked) mask."
-            raise ValueError(msg)
+    blocked = checked_p42_mask(maze)
     width = maze.width
     height = maze.height
-    grid = maze.grid
-    visited = set()
-    DIRS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
-    OPP = [2, 3, 0, 1]
-
-    cx, cy = maze.entry
-    visited.add((cx, cy))
-
-    def kill(x: int, y: int) -> tuple[int, int]:
+    stride = width + 2
+    if state is None:
+        state = GenState()
+    if state.started:
+        state.check("hak", width, height)
+        if rng is not None:
+            rng.setstate(state.rng.getstate())
+            state.rng = rng
+    else:
+        state.algorithm = "hak"
+        state.width = width
+        state.height = height
+        state.rng = Random(maze.seed) if rng is None else rng
+        state.cells = flatten(maze.grid)
+
+        # Same padded bitmap as dfs(), but the border and the 42 mask
+        # are CLOSED so that connect() can tell them from visited cells
+        visited = padded_mask(width, height, blocked, CLOSED)
+        ex, ey = maze.entry
+        visited[(ex + 1) * stride + ey + 1] = VISITED
+        state.visited = visited
+        state.at = (ex, ey)
+        # Unvisited, unblocked cells left in each row and the linear
+        # index of the first cell that may still be unvisited.
+        state.remaining = [width] * height
+        if blocked:
+            for bx, _ in blocked:
+                state.remaining[bx] -= 1
+        state.remaining[ex] -= 1
+        state.cursor = 0
+
+    choice = state.rng.choice
+    cells = state.cells
+    visited = state.visited
+    remaining = state.remaining
+    cursor = state.cursor
+    step = [-stride, 1, stride, -1]
+    cell_step = [-width, 1, width, -1]
+    wall = [~1, ~2, ~4, ~8]
+    opposite_wall = [~4, ~8, ~1, ~2]
+    # Carve events of the current step are stored in place; a step is
+    # handed out as one slice when the buffer is full
+    carved = [0] * every
+    k = 0
+
+    def connect(x: int, y: int) -> int:
         """
-        Hunt stage of the algoruithm
+        Join an unvisited cell to a random visited neighbor
 
         :param x: Coordinate
         :param y: Coordinate
+        :return: Carve event of the new passage, -1 if not connected
         """
-        while True:
-            neighbors = []
+        p = (x + 1) * stride + y + 1
+        if visited[p]:
+            return -1
 
-            for i, (dx, dy) in enumerate(DIRS):
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < height and 0 <= ny < width:
-                    if blocked:
-                        if (nx, ny) not in visited and (nx, ny) not in blocked:
-                            neighbors.append((nx, ny, i))
-                    else:
-                        if (nx, ny) not in visited:
-                            neighbors.append((nx, ny, i))
+        candidates = [d for d in range(4) if visited[p + step[d]] == VISITED]
+        if not candidates:
+            return -1
 
-            if not neighbors:
-                return x, y
+        d = choice(candidates)
+        c = x * width + y
+        cells[c] &= wall[d]
+        cells[c + cell_step[d]] &= opposite_wall[d]
 
-            nx, ny, i = choice(neighbors)
+        visited[p] = VISITED
+        remaining[x] -= 1
+        return c << 2 | d
 
-            grid[x][y] &= ~(1 << i)
-            grid[nx][ny] &= ~(1 << OPP[i])
-
-            visited.add((nx, ny))
-            x, y = nx, ny
-
-    def hunt() -> tuple[int, int] | None:
+    def hunt() -> int:
         """
-        Hunt stage of the algorithm
+        Hunt stage of the algorithm, scanning from (0, 0)
         """
         for x in range(height):
             for y in range(width):
-                if blocked:
-                    if (x, y) in visited or (x, y) in blocked:
-                        continue
-                else:
-                    if (x, y) in visited:
-                        continue
-
-                candidates = []
-                for i, (dx, dy) in enumerate(DIRS):
-                    nx, ny = x + dx, y + dy
-                    if 0 <= nx < height and 0 <= ny < width:
-                        if blocked:
-                            if (nx, ny) in visited and (x, y) not in blocked:
-                                candidates.append((nx, ny, i))
-                        else:
-                            if (nx, ny) in visited:
-                                candidates.append((nx, ny, i))
-
-                if candidates:
-                    nx, ny, i = choice(candidates)
-
-                    grid[x][y] &= ~(1 << i)
-                    grid[nx][ny] &= ~(1 << OPP[i])
-
-                    visited.add((x, y))
-                    return x, y
-
-        return None
-
-    x, y = cx, cy
+                event = connect(x, y)
+                if event >= 0:
+                    return event
+
+        return -1
+
+    def hunt_incremental() -> int:
+        """
+        Hunt stage of the algorithm, resuming from the cursor
+        """
+        nonlocal cursor
+        size = height * width
+        while cursor < size:
+            x, y = divmod(cursor, width)
+            if not remaining[x]:
+                cursor = (x + 1) * width
+            elif visited[cursor + stride + 1 + 2 * x]:
+                cursor += 1
+            else:
+                break
+        else:
+            return -1
+
+        row, col = divmod(cursor, width)
+        for x in range(row, height):
+            if not remaining[x]:
+                continue
+            for y in range(col if x == row else 0, width):
+                event = connect(x, y)
+                if event >= 0:
+                    return event
+
+        return -1
+
+    # The kill walk runs as a bounded loop whose index is the slot of
+    # the next carve event, so a full step is the end of the loop. There
+    # are fewer carves than cells, so without steps it is never reached.
+    limit = every or height * width
+    x, y = state.at
     while True:
-        x, y = kill(x, y)
-        found = hunt()
-        if not found:
+        # Kill stage: random walk from (x, y) until stuck
+        p = (x + 1) * stride + y + 1
+        c = x * width + y
+        while True:
+            for k in range(k, limit):
+                neighbors = [d for d in range(4) if not visited[p + step[d]]]
+                if not neighbors:
+                    break
+
+                d = choice(neighbors)
+                n = c + cell_step[d]
+                cells[c] &= wall[d]
+                cells[n] &= opposite_wall[d]
+                p += step[d]
+                visited[p] = VISITED
+                remaining[p // stride - 1] -= 1
+                if every:
+                    carved[k] = c << 2 | d
+                c = n
+            else:
+                state.at = divmod(c, width)
+                state.cursor = cursor
+                yield carved[:]
+                k = 0
+                continue
             break
-        x, y = found
 
-    if not maze.perfect:
-        make_imperfect(maze, blocked)
+        found = hunt_incremental() if incremental else hunt()
+        if found < 0:
+            break
+        x, y = divmod(found >> 2, width)
+        if every:
+            carved[k] = found
+            k += 1
+            if k == every:
+                state.at = (x, y)
+                state.cursor = cursor
+                yield carved[:]
+                k = 0
+    state.cursor = cursor
+    if every and k:
+        yield carved[:k]
+    yield from finish_steps(maze, blocked, state, every)
@@ -1,19 +1,102 @@
 from __future__ import annotations
-from random import random
-from typing import TYPE_CHECKING
+from importlib import import_module
+from random import Random
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+from .grid import BATCH, Observer, flatten, notify, store
+from .state import GenState
 
 if TYPE_CHECKING:
     from .mazegen import MazeGenerator
 
+# NumPy is optional: the vectorized pass falls back to the scan below
+# when it is not installed
+np: Any
+try:
+    np = import_module("numpy")
+except ImportError:
+    np = None
+HAS_NUMPY = np is not None
+
+
+def _imperfect_numpy(
+    cells: bytearray,
+    width: int,
+    height: int,
+    blocked: set[tuple[int, int]] | None,
+    probability: float,
+    rng: Random,
+) -> list[int]:
+    """
+    Vectorized imperfect pass over the flat cells, updated in place
+
+    Dead ends and the wall each of them would remove are found on the
+    whole grid at once, with one random draw per dead end taken from a
+    single getrandbits() call. A dead end that an earlier removal opens
+    keeps only that opening, as in the sequential scan, but removals are
+    decided from the original grid, so the result differs from it.
+
+    :return: Carve events of the removed walls, in row-major order
+    """
+    grid = np.frombuffer(cells, dtype=np.uint8)
+    free = np.ones(width * height, dtype=bool)
+    if blocked:
+        free[[x * width + y for x, y in blocked]] = False
+
+    popcount = np.array([bin(v).count("1") for v in range(16)])
+    dead = free & (popcount[~grid & 15] == 1)
+
+    # eligible[d]: the wall in direction d is closed and leads to an open
+    # cell of the grid, computed with shifted views of the 2D grid
+    g = grid.reshape(height, width)
+    f = free.reshape(height, width)
+    eligible = np.zeros((4, height, width), dtype=bool)
+    eligible[0, 1:] = (g[1:] & 1 != 0) & f[:-1] & (g[:-1] & 4 != 0)
+    eligible[1, :, :-1] = (g[:, :-1] & 2 != 0) & f[:, 1:] & (g[:, 1:] & 8 != 0)
+    eligible[2, :-1] = (g[:-1] & 4 != 0) & f[1:] & (g[1:] & 1 != 0)
+    eligible[3, :, 1:] = (g[:, 1:] & 8 != 0) & f[:, :-1] & (g[:, :-1] & 2 != 0)
+    eligible = eligible.reshape(4, -1)
+
+    source = np.flatnonzero(dead & eligible.any(axis=0))
+    count = len(source)
+    draws = np.frombuffer(
+        rng.getrandbits(32 * count).to_bytes(4 * count, "little"),
+        dtype=np.uint32,
+    )
+    source = source[draws < int(probability * 2**32)]
+    direction = eligible[:, source].argmax(axis=0)
+    step = np.array([-width, 1, width, -1])
+    opposite = np.array([2, 3, 0, 1])
+    clear = np.array([0xFE, 0xFD, 0xFB, 0xF7], dtype=np.uint8)
+    target = source + step[direction]
+    first = ~np.isin(source, target[target > source])
+    source = source[first]
+    direction = direction[first]
+    target = target[first]
+
+    grid[source] &= clear[direction]
+    np.bitwise_and.at(grid, target, clear[opposite[direction]])
+    events: list[int] = ((source << 2) | direction).tolist()
+    return events
+
 
 def make_imperfect(
     maze: MazeGenerator,
     blocked: set[tuple[int, int]] | None,
     probability: float = 0.5,
+    rng: Random | None = None,
+    observer: Observer | None = None,
+    batch: int = BATCH,
+    vectorized: bool | None = None,
 ) -> None:
     """
     Remove some walls to create loops (imperfect maze).
     probability: chance to remove a wall at each dead end.
+    rng: random number generator, seeded from maze.seed if None.
+    observer: called with the carve events of every batch removed walls.
+    batch: number of removed walls per observer call.
+    vectorized: use the NumPy pass if NumPy is installed (default:
+    maze.vectorized). It is much faster on large grids but removes a
+    different, equally random, set of walls than the scan.
     """
     neighbors = [(-1, 0), (0, 1), (1, 0), (0, -1)]
     opposite_wall = [2, 3, 0, 1]
@@ -21,13 +104,33 @@ def make_imperfect(
     assert maze.height is not None
     assert maze.width is not None
     assert maze.grid is not None
+    if rng is None:
+        rng = Random(maze.seed)
+    width = maze.width
+    cells = flatten(maze.grid)
+    if vectorized is None:
+        vectorized = maze.vectorized
+    if vectorized and HAS_NUMPY:
+        events = _imperfect_numpy(
+            cells, width, maze.height, blocked, probability, rng
+        )
+        store(maze.grid, cells, width)
+        if observer is not None:
+            for k in range(0, len(events), batch):
+                observer(events[k:k + batch])
+        return
+    random = rng.random
+    # Blocked cells by linear index, a handful of cells for the 42 mask
+    blocked_at = {bx * width + by for bx, by in blocked or ()}
+    carved: list[int] = []
+    countdown = batch
     for x in range(maze.height):
         for y in range(maze.width):
-            if blocked and (x, y) in blocked:
+            if x * width + y in blocked_at:
                 continue
             open_count = 0
             for i in range(4):
-                if not (maze.grid[x][y] & (1 << i)):
+                if not (cells[x * width + y] & (1 << i)):
                     open_count += 1
             if open_count != 1:
                 continue
@@ -35,12 +138,121 @@ def make_imperfect(
                 nx, ny = x + dx, y + dy
                 if not (0 <= nx < maze.height and 0 <= ny < maze.width):
                     continue
-                if blocked and (nx, ny) in blocked:
+                if nx * width + ny in blocked_at:
                     continue
-                if (maze.grid[x][y] & (1 << i)) and (
-                    maze.grid[nx][ny] & (1 << opposite_wall[i])
+                if (cells[x * width + y] & (1 << i)) and (
+                    cells[nx * width + ny] & (1 << opposite_wall[i])
                 ):
                     if random() < probability:
-                        maze.grid[x][y] &= ~(1 << i)
-                        maze.grid[nx][ny] &= ~(1 << opposite_wall[i])
+                        cells[x * width + y] &= ~(1 << i)
+                        cells[nx * width + ny] &= ~(1 << opposite_wall[i])
+                        if observer is not None:
+                            carved.append((x * width + y) << 2 | i)
+                            countdown -= 1
+                            if not countdown:
+                                notify(observer, carved)
+                                countdown = batch
                     break
+    store(maze.grid, cells, width)
+    notify(observer, carved)
+
+
+def imperfect_rows(
+    rows: Iterable[bytearray],
+    width: int,
+    height: int,
+    blocked: set[tuple[int, int]] | None,
+    rng: Random,
+    probability: float = 0.5,
+) -> Iterator[bytearray]:
+    """
+    make_imperfect() over a stream of rows, for generators that produce
+    the maze row by row. Walls are removed with the same rule and in the
+    same order; only three rows are held at a time and a row is passed on
+    once the row below it has been processed.
+
+    :param rows: Finished rows of wall values, first row first
+    :param width: Number of columns
+    :param height: Number of rows
+    :param blocked: Blocked (row, col) cells, such as the 42 mask
+    :param rng: Random number generator
+    :param probability: Chance to remove a wall at each dead end
+    """
+    neighbors = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+    opposite_wall = [2, 3, 0, 1]
+    random = rng.random
+    # Blocked cells of the rows with any, other rows have none
+    clear = bytes(width)
+    masked: dict[int, bytearray] = {}
+    for bx, by in blocked or ():
+        masked.setdefault(bx, bytearray(width))[by] = 1
+    it = iter(rows)
+    prev = bytearray()
+    cur = next(it, None)
+    x = 0
+    while cur is not None:
+        nxt = next(it, None)
+        here = masked.get(x, clear)
+        above = masked.get(x - 1, clear)
+        below = masked.get(x + 1, clear)
+        for y in range(width):
+            if here[y]:
+                continue
+            if (~cur[y] & 15).bit_count() != 1:
+                continue
+            for i, (dx, dy) in enumerate(neighbors):
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < height and 0 <= ny < width):
+                    continue
+                if (here if not dx else above if dx < 0 else below)[ny]:
+                    continue
+                row = cur if not dx else prev if dx < 0 else nxt
+                assert row is not None
+                if (cur[y] & (1 << i)) and (
+                    row[ny] & (1 << opposite_wall[i])
+                ):
+                    if random() < probability:
+                        cur[y] &= ~(1 << i)
+                        row[ny] &= ~(1 << opposite_wall[i])
+                    break
+        if x:
+            yield prev
+        prev = cur
+        cur = nxt
+        x += 1
+    if x:
+        yield prev
+
+
+def finish_steps(
+    maze: MazeGenerator,
+    blocked: set[tuple[int, int]] | None,
+    state: GenState,
+    every: int,
+) -> Iterator[list[int]]:
+    """
+    Last step of a step generator: store the carved cells in the grid,
+    run the imperfect pass if needed and mark the state done.
+
+    The imperfect pass is a single scan and is not split into steps; its
+    carve events are yielded afterwards, every ``every`` events.
+    """
+    assert maze.grid is not None
+    assert maze.width is not None
+    store(maze.grid, state.cells, maze.width)
+    if state.done:
+        return
+    pending: list[int] = []
+    if not maze.perfect:
+        make_imperfect(
+            maze,
+            blocked,
+            rng=state.rng,
+            observer=pending.extend if every else None,
+            batch=every or BATCH,
+        )
+        state.cells = flatten(maze.grid)
+    state.done = True
+    if every:
+        for k in range(0, len(pending), every):
+            yield pending[k:k + every]
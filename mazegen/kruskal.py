@@ -0,0 +1,114 @@
+"""
+Maze generator using randomized Kruskal's algorithm.
+
+Every wall between two open cells is an edge; the edges are shuffled and a
+wall is removed whenever it separates two cells that are not connected yet.
+Connectivity is tracked with an array-backed union-find (one parent slot
+per cell) with path compression and union by size.
+"""
+
+from __future__ import annotations
+from random import Random
+from typing import TYPE_CHECKING
+from .mask_42 import checked_p42_mask
+from .imperfect import make_imperfect
+from .grid import BATCH, Observer, flatten, notify, padded_mask, store
+
+if TYPE_CHECKING:
+    from .mazegen import MazeGenerator
+
+
+def kruskal(
+    maze: MazeGenerator,
+    rng: Random | None = None,
+    observer: Observer | None = None,
+    batch: int = BATCH,
+) -> None:
+    """
+    Randomized Kruskal algorithm used by the MazeGenerator class
+
+    :param maze: MazeGenerator class
+    :param rng: Random number generator, seeded from maze.seed if None
+    :param observer: Called with the carve events of every batch carves
+    :param batch: Number of carves per observer call
+    """
+    assert maze.height is not None
+    assert maze.width is not None
+    assert maze.grid is not None
+
+    blocked = checked_p42_mask(maze)
+    if rng is None:
+        rng = Random(maze.seed)
+    width = maze.width
+    height = maze.height
+    cells = flatten(maze.grid)
+
+    # Edges are encoded like carve events, cell << 2 | direction, with
+    # only the east and south wall of each cell
+    stride = width + 2
+    closed = padded_mask(width, height, blocked)
+    edges = []
+    for x in range(height):
+        for y in range(width):
+            p = (x + 1) * stride + y + 1
+            if closed[p]:
+                continue
+            c = x * width + y
+            if not closed[p + 1]:
+                edges.append(c << 2 | 1)
+            if not closed[p + stride]:
+                edges.append(c << 2 | 2)
+    rng.shuffle(edges)
+
+    parent = list(range(width * height))
+    size = [1] * (width * height)
+    joins = width * height - len(blocked or ()) - 1
+    cell_step = [0, 1, width]
+    carved: list[int] = []
+    log = None if observer is None else carved.append
+    countdown = batch
+    for edge in edges:
+        if not joins:
+            break
+        a = edge >> 2
+        d = edge & 3
+        b = a + cell_step[d]
+
+        ra = a
+        while parent[ra] != ra:
+            ra = parent[ra]
+        while parent[a] != ra:
+            parent[a], a = ra, parent[a]
+        rb = b
+        while parent[rb] != rb:
+            rb = parent[rb]
+        while parent[b] != rb:
+            parent[b], b = rb, parent[b]
+        if ra == rb:
+            continue
+        if size[ra] < size[rb]:
+            ra, rb = rb, ra
+        parent[rb] = ra
+        size[ra] += size[rb]
+        joins -= 1
+
+        c = edge >> 2
+        if d == 1:
+            cells[c] &= ~2
+            cells[c + 1] &= ~8
+        else:
+            cells[c] &= ~4
+            cells[c + width] &= ~1
+        if log is not None:
+            log(edge)
+            countdown -= 1
+            if not countdown:
+                notify(observer, carved)
+                countdown = batch
+    store(maze.grid, cells, width)
+    notify(observer, carved)
+
+    if not maze.perfect:
+        make_imperfect(
+            maze, blocked, rng=rng, observer=observer, batch=batch
+        )
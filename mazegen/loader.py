@@ -0,0 +1,282 @@
+"""
+Maze output file loader.
+
+The file is read in one go and the grid block is decoded with a single
+``bytes.translate`` that maps hex digits to wall values and drops the line
+breaks, giving the compact row-major grid used by the solver and the
+visualizer. No per-line or per-cell Python objects are created.
+Binary .mzb files are recognised by their magic and decoded by mzb.py.
+
+MappedGrid opens either format through mmap instead, for mazes too large
+to load: rows have a fixed width, so any cell is read in O(1) straight
+from its byte offset and only the pages actually touched are paged in.
+"""
+
+from __future__ import annotations
+from mmap import mmap, ACCESS_READ
+from os import PathLike
+from pathlib import Path
+from types import TracebackType
+from typing import Iterator, TypedDict, Union, overload
+from .mzb import HAS_ENTRY, HAS_EXIT, HAS_PATH, HEADER, MAGIC, PERFECT
+from .mzb import parse_mzb, unpack_cells, unpack_path
+
+INVALID = 0xFF
+FROM_HEX = bytes(
+    int(chr(c), 16) if chr(c) in "0123456789abcdefABCDEF" else INVALID
+    for c in range(256)
+)
+
+
+class MazeData(TypedDict):
+    cells: bytearray
+    width: int
+    height: int
+    entry: tuple[int, int] | None
+    exit: tuple[int, int] | None
+    path: str | None
+    seed: int | None
+    algorithm: str | None
+    perfect: bool | None
+
+
+def _coords(line: bytes) -> tuple[int, int] | None:
+    """
+    Parse an "x, y" line
+
+    :param line: Raw line without line break
+    """
+    if not line.strip():
+        return None
+    parts = line.split(b",")
+    if len(parts) != 2:
+        raise ValueError(f"Invalid coordinates: {line.decode()!r}")
+    return int(parts[0]), int(parts[1])
+
+
+def parse_maze(data: bytes) -> MazeData:
+    """
+    Decode the contents of a maze output file
+
+    :param data: File contents
+    """
+    if b"\r" in data:
+        data = data.replace(b"\r\n", b"\n")
+    data = data.lstrip(b"\n")
+    end = data.find(b"\n\n")
+    if end < 0:
+        end = len(data.rstrip(b"\n"))
+    width = data.find(b"\n", 0, end)
+    if width < 0:
+        width = end
+
+    block = data[:end]
+    height = (len(block) + 1) // (width + 1)
+    if (
+        width == 0
+        or len(block) != height * (width + 1) - 1
+        or block[width::width + 1].strip(b"\n")
+    ):
+        raise ValueError("Maze rows must all have the same length")
+    cells = bytearray(block.translate(FROM_HEX, b"\n"))
+    if INVALID in cells:
+        raise ValueError("Maze grid contains a non hexadecimal digit")
+
+    tail = data[end + 2:].split(b"\n", 3)
+    tail += [b""] * (3 - len(tail))
+    path = tail[2].strip().upper().decode()
+    return {
+        "cells": cells,
+        "width": width,
+        "height": height,
+        "entry": _coords(tail[0]),
+        "exit": _coords(tail[1]),
+        "path": path or None,
+        "seed": None,
+        "algorithm": None,
+        "perfect": None,
+    }
+
+
+def load_maze(file: Union[str, PathLike[str]]) -> MazeData:
+    """
+    Load a maze output file, text or binary (.mzb, detected by its magic)
+
+    :param file: Path to the maze file
+    """
+    data = Path(file).read_bytes()
+    if data.startswith(MAGIC):
+        return parse_mzb(data)
+    return parse_maze(data)
+
+
+class MappedGrid:
+    """Read-only, mmap-backed maze grid.
+
+    Indexing works like the flat ``bytearray`` grid: ``grid[i]`` is the
+    wall value of cell ``i = y * width + x`` and ``grid[a:b]`` returns the
+    wall values of a range of cells as bytes. Nothing but the header and
+    the trailing entry/exit/path lines is read up front.
+    """
+
+    def __init__(self, file: Union[str, PathLike[str]]) -> None:
+        """Map a maze file.
+
+        Args:
+            file: Path to a text or .mzb maze file.
+        """
+        self.file = file
+        with open(file, "rb") as fp:
+            self._mm = mmap(fp.fileno(), 0, access=ACCESS_READ)
+        self.entry: tuple[int, int] | None = None
+        self.exit: tuple[int, int] | None = None
+        self.path: str | None = None
+        self.perfect: bool | None = None
+        self.binary = self._mm[:len(MAGIC)] == MAGIC
+        if self.binary:
+            self._map_mzb()
+        else:
+            self._map_text()
+
+    def _map_text(self) -> None:
+        """Locate the grid block and parse the trailing lines."""
+        mm = self._mm
+        width = mm.find(b"\n")
+        if width < 0:
+            width = len(mm)
+        stride = width + 1
+        if width and mm[width - 1] == ord("\r"):
+            width -= 1
+        # The grid ends at the blank line before the short trailing lines,
+        # so search for it backwards from the end of the file instead of
+        # scanning (and paging in) the whole grid
+        last = len(mm)
+        while last and mm[last - 1] in b"\r\n":
+            last -= 1
+        blank = b"\n\n" if stride == width + 1 else b"\n\r\n"
+        end = mm.rfind(blank, 0, last)
+        if end >= 0 and (end + 1) % stride:
+            end = mm.find(blank)
+        if end < 0:
+            end = last + stride - width - 1
+        if width == 0 or (end + 1) % stride:
+            raise ValueError("Maze rows must all have the same length")
+        self.width = width
+        self.height = (end + 1) // stride
+        self._stride = stride
+        self._base = 0
+
+        tail = mm[end:].replace(b"\r\n", b"\n").lstrip(b"\n").split(b"\n")
+        tail += [b""] * (3 - len(tail))
+        self.entry = _coords(tail[0])
+        self.exit = _coords(tail[1])
+        self.path = tail[2].strip().upper().decode() or None
+
+    def _map_mzb(self) -> None:
+        """Parse the .mzb header and locate the cell section."""
+        mm = self._mm
+        (
+            _,
+            version,
+            flags,
+            _,
+            width,
+            height,
+            ex,
+            ey,
+            xx,
+            xy,
+            _,
+            steps,
+            _,
+        ) = HEADER.unpack_from(mm)
+        if version != 1:
+            raise ValueError("Not a .mzb v1 file")
+        self.width = width
+        self.height = height
+        self._stride = 0
+        self._base = HEADER.size
+        if flags & HAS_ENTRY:
+            self.entry = (ex, ey)
+        if flags & HAS_EXIT:
+            self.exit = (xx, xy)
+        self.perfect = bool(flags & PERFECT)
+        if flags & HAS_PATH:
+            start = HEADER.size + (width * height + 1) // 2
+            self.path = unpack_path(mm[start:start + (steps + 3) // 4], steps)
+
+    def __len__(self) -> int:
+        return self.width * self.height
+
+    @overload
+    def __getitem__(self, index: int) -> int: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> bytes: ...
+
+    def __getitem__(self, index: int | slice) -> int | bytes:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("MappedGrid slices must be contiguous")
+            return self._span(start, stop)
+        if index < 0:
+            index += len(self)
+        if self._stride:
+            y, x = divmod(index, self.width)
+            return FROM_HEX[self._mm[y * self._stride + x]]
+        byte = self._mm[self._base + (index >> 1)]
+        return byte >> 4 if index & 1 else byte & 0x0F
+
+    def _span(self, start: int, stop: int) -> bytes:
+        """Wall values of cells start..stop-1."""
+        if stop <= start:
+            return b""
+        mm = self._mm
+        if not self._stride:
+            first = self._base + (start >> 1)
+            last = self._base + ((stop + 1) >> 1)
+            cells = unpack_cells(mm[first:last], (last - first) * 2)
+            offset = start & 1
+            return bytes(cells[offset:offset + stop - start])
+        w = self.width
+        parts = []
+        y, x = divmod(start, w)
+        while start < stop:
+            take = min(w - x, stop - start)
+            offset = y * self._stride + x
+            parts.append(mm[offset:offset + take])
+            start += take
+            y += 1
+            x = 0
+        return b"".join(parts).translate(FROM_HEX)
+
+    def rows(self, start: int = 0, stop: int | None = None) -> Iterator[bytes]:
+        """Iterate over the decoded rows start..stop-1.
+
+        Args:
+            start: First row.
+            stop: Row after the last one (default: height).
+        """
+        w = self.width
+        for y in range(start, self.height if stop is None else stop):
+            yield self[y * w:(y + 1) * w]
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._mm.close()
+
+    def __enter__(self) -> MappedGrid:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+# Flat cell storage: loaded into memory or mapped from the file
+Cells = Union[bytearray, MappedGrid]
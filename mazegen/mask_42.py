@@ -1,76 +1,102 @@
 from __future__ import annotations
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .mazegen import MazeGenerator
 
+# Logo cells as (x, y) offsets from the center of the maze
+PATTERN_7X5 = (
+    (-3, -2),
+    (-1, -2),
+    (1, -2),
+    (2, -2),
+    (3, -2),
+    (-3, -1),
+    (-1, -1),
+    (3, -1),
+    (-3, 0),
+    (-2, 0),
+    (-1, 0),
+    (1, 0),
+    (2, 0),
+    (3, 0),
+    (-1, 1),
+    (1, 1),
+    (-1, 2),
+    (1, 2),
+    (2, 2),
+    (3, 2),
+)
+
+PATTERN_5X5 = (
+    (-2, -2),
+    (1, -2),
+    (2, -2),
+    (-2, -1),
+    (2, -1),
+    (-2, 0),
+    (-1, 0),
+    (1, 0),
+    (2, 0),
+    (-1, 1),
+    (1, 1),
+    (-1, 2),
+    (1, 2),
+    (2, 2),
+)
+
+
+@lru_cache(maxsize=64)
+def p42_cells(width: int, height: int) -> tuple[tuple[int, int], ...]:
+    """
+    Blocked (row, col) cells of the 42 logo, in row-major order
+
+    Cached by size. Empty when the maze is smaller than 7x7.
+
+    :param width: Number of columns
+    :param height: Number of rows
+    """
+    if width < 7 or height < 7:
+        return ()
+    pattern = PATTERN_5X5 if width <= 8 else PATTERN_7X5
+    cx = width // 2
+    cy = height // 2
+    return tuple(sorted(
+        (cy + oy, cx + ox)
+        for ox, oy in pattern
+        if 0 <= cx + ox < width and 0 <= cy + oy < height
+    ))
+
 
 def make_p42_mask(maze: MazeGenerator) -> set[tuple[int, int]] | None:
     """
     Function sets a mask of the 42 logo in the center of the maze
     This is used in the dfs and hak maze generators
 
+    The cells come from p42_cells(); the set is a fresh copy.
+
     :param maze: MazeGenerator class
     """
-    if maze.width and maze.height:
-        cx = maze.width // 2
-        cy = maze.height // 2
-    else:
+    if not (maze.width and maze.height):
         raise ValueError("Width and/or height can't be None")
+    cells = p42_cells(maze.width, maze.height)
+    return set(cells) if cells else None
 
-    patern_7x5 = {
-        (-3, -2),
-        (-1, -2),
-        (1, -2),
-        (2, -2),
-        (3, -2),
-        (-3, -1),
-        (-1, -1),
-        (3, -1),
-        (-3, 0),
-        (-2, 0),
-        (-1, 0),
-        (1, 0),
-        (2, 0),
-        (3, 0),
-        (-1, 1),
-        (1, 1),
-        (-1, 2),
-        (1, 2),
-        (2, 2),
-        (3, 2),
-    }
-
-    patern_5x5 = {
-        (-2, -2),
-        (1, -2),
-        (2, -2),
-        (-2, -1),
-        (2, -1),
-        (-2, 0),
-        (-1, 0),
-        (1, 0),
-        (2, 0),
-        (-1, 1),
-        (1, 1),
-        (-1, 2),
-        (1, 2),
-        (2, 2),
-    }
-
-    pattern = patern_7x5
-    blocked = None
 
-    if maze.width <= 8:
-        pattern = patern_5x5
+def checked_p42_mask(maze: MazeGenerator) -> set[tuple[int, int]] | None:
+    """
+    make_p42_mask() for the generators: also rejects an entry or exit
+    inside the mask
 
-    if maze.width < 7 or maze.height < 7:
-        return blocked
-    else:
-        blocked = set()
-        for ox, oy in pattern:
-            x = cx + ox
-            y = cy + oy
-            if 0 <= x < maze.width and 0 <= y < maze.height:
-                blocked.add((y, x))
+    :param maze: MazeGenerator class
+    """
+    blocked = make_p42_mask(maze)
+    if blocked:
+        if maze.entry in blocked:
+            msg = f"Entry point {maze.entry} is inside the 42 (blocked) mask."
+            raise ValueError(msg)
+        if maze.exit in blocked:
+            msg = f"Exit point {maze.exit} is inside the 42 (blocked) mask."
+            raise ValueError(msg)
     return blocked
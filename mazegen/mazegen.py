@@ -1,8 +1,45 @@
-from typing import Union, TypedDict, cast
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    TypeVar,
+    Union,
+    TypedDict,
+    cast,
+)
 from pathlib import Path
-from os import PathLike, access, R_OK
-from .dfs import dfs
-from .hak import hak
+from os import PathLike, access, cpu_count, R_OK
+from random import Random
+from copy import copy
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from .dfs import dfs, dfs_steps
+from .hak import hak, hak_steps
+from .kruskal import kruskal
+from .prim import prim
+from .wilson import wilson
+from .eller import eller, eller_rows
+from .imperfect import imperfect_rows
+from .mask_42 import checked_p42_mask
+from .aldous_broder import aldous_broder
+from .grid import BATCH, Grid, Observer, flatten, new_grid, rows
+from .writer import write_maze
+from .mzb import encode_mzb
+from .state import GenState
+
+T = TypeVar("T")
+
+# Engines selectable with the ALGORITHM key, called as
+# engine(maze, rng, observer=..., batch=...)
+ALGORITHMS: dict[str, Callable[..., None]] = {
+    "dfs": dfs,
+    "hak": hak,
+    "kruskal": kruskal,
+    "prim": prim,
+    "wilson": wilson,
+    "eller": eller,
+    "aldous-broder": aldous_broder,
+}
 
 
 class Config(TypedDict):
@@ -14,11 +51,37 @@ class Config(TypedDict):
     perfect: bool
     seed: int | None
     algorithm: str | None
+    compact: bool
+    animate: bool
+    stream: bool
+    vectorized: bool
+
+
+def _generate_seed(template: "MazeGenerator", seed: int) -> Grid:
+    """Worker of MazeGenerator.generate_many()"""
+    maze = copy(template)
+    maze.seed = seed
+    maze.reset()
+    maze.generate()
+    assert maze.grid is not None
+    return maze.grid
+
+
+def _write_seed(template: "MazeGenerator", seed: int) -> Path:
+    """Worker of MazeGenerator.write_many()"""
+    maze = copy(template)
+    maze.seed = seed
+    output = maze.seed_output(seed)
+    maze.output = output
+    maze.reset()
+    maze.generate()
+    maze.write()
+    return output
 
 
 class MazeGenerator:
     def __init__(self) -> None:
-        self._grid: list[list[int]] | None = None
+        self._grid: Grid | None = None
         self._output: Union[str, PathLike[str]] | None = None
         self._width: int | None = None
         self._height: int | None = None
@@ -27,13 +90,18 @@ class MazeGenerator:
         self._perfect: bool | None = None
         self._seed: int | None = None
         self._algorithm: str | None = None
+        self._compact: bool = False
+        self._animate: bool = False
+        self._stream: bool = False
+        self._vectorized: bool = False
+        self._rng = Random()
 
     @property
-    def grid(self) -> list[list[int]] | None:
+    def grid(self) -> Grid | None:
         return self._grid
 
     @grid.setter
-    def grid(self, grid: list[list[int]]) -> None:
+    def grid(self, grid: Grid) -> None:
         self._grid = grid
 
     @property
@@ -100,6 +168,42 @@ class MazeGenerator:
     def algorithm(self, algorithm: str) -> None:
         self._algorithm = algorithm
 
+    @property
+    def rng(self) -> Random:
+        return self._rng
+
+    @property
+    def compact(self) -> bool:
+        return self._compact
+
+    @compact.setter
+    def compact(self, compact: bool) -> None:
+        self._compact = compact
+
+    @property
+    def animate(self) -> bool:
+        return self._animate
+
+    @animate.setter
+    def animate(self, animate: bool) -> None:
+        self._animate = animate
+
+    @property
+    def stream(self) -> bool:
+        return self._stream
+
+    @stream.setter
+    def stream(self, stream: bool) -> None:
+        self._stream = stream
+
+    @property
+    def vectorized(self) -> bool:
+        return self._vectorized
+
+    @vectorized.setter
+    def vectorized(self, vectorized: bool) -> None:
+        self._vectorized = vectorized
+
     def read(self, file: Union[str, PathLike[str]] = "config.txt") -> None:
         path = Path(file)
 
@@ -176,6 +280,10 @@ class MazeGenerator:
                 "perfect": cast(bool, raw["perfect"]),
                 "seed": cast(int | None, raw.get("seed")),
                 "algorithm": cast(str | None, raw.get("algorithm")),
+                "compact": cast(bool, raw.get("compact", False)),
+                "animate": cast(bool, raw.get("animate", False)),
+                "stream": cast(bool, raw.get("stream", False)),
+                "vectorized": cast(bool, raw.get("vectorized", False)),
             }
         except Exception as e:
             raise ValueError(f"Invalid configuration: {e}")
@@ -191,9 +299,21 @@ class MazeGenerator:
         if config["entry"] == config["exit"]:
             raise ValueError("entry and exit must be different")
 
-        i_width = range(config["width"])
-        i_height = range(config["height"])
-        self._grid = [[15 for _ in i_width] for _ in i_height]
+        if (
+            config["algorithm"] is not None
+            and config["algorithm"] not in ALGORITHMS
+        ):
+            names = ", ".join(ALGORITHMS)
+            raise ValueError(f"algorithm must be one of: {names}")
+
+        if config["stream"] and config["algorithm"] not in (None, "eller"):
+            raise ValueError("stream requires the eller algorithm")
+
+        self._grid = None
+        if not config["stream"]:
+            self._grid = new_grid(
+                config["width"], config["height"], config["compact"]
+            )
         self._width = config["width"]
         self._height = config["height"]
         self._entry = config["entry"]
@@ -202,35 +322,178 @@ class MazeGenerator:
         self._perfect = config["perfect"]
         self._seed = config["seed"]
         self._algorithm = config["algorithm"]
-
-    def write(self) -> None:
+        self._compact = config["compact"]
+        self._animate = config["animate"]
+        self._stream = config["stream"]
+        self._vectorized = config["vectorized"]
+        if self._stream:
+            self._algorithm = "eller"
+
+    def _check_stream(self) -> None:
+        """
+        Raise in stream mode, where no grid is built to work on
+        """
+        if self._stream:
+            raise ValueError("stream mode: use write_stream()")
+
+    def write(self, path: str | None = None) -> None:
+        self._check_stream()
         if self._grid is None or self._output is None:
             return
+        assert self._width is not None
+
+        if Path(self._output).suffix == ".mzb":
+            assert self._height is not None
+            data = encode_mzb(
+                flatten(self._grid),
+                self._width,
+                self._height,
+                self._entry,
+                self._exit,
+                self._seed,
+                self._algorithm,
+                self._perfect,
+                path,
+            )
+            Path(self._output).write_bytes(data)
+            return
 
-        with open(self._output, "w") as fp:
-            for row in self._grid:
-                fp.write("".join(hex(v)[2:].upper() for v in row))
-                fp.write("\n")
-
-            fp.write("\n")
-
-            if self._entry:
-                fp.write(f"{self._entry[0]}, {self._entry[1]}\n")
-            if self._exit:
-                fp.write(f"{self._exit[0]}, {self._exit[1]}\n")
-
-    def generate(self) -> None:
-        match self._algorithm:
-            case "dfs":
-                dfs(self)
-            case "hak":
-                hak(self)
-            case _:
-                dfs(self)
+        write_maze(
+            self._output,
+            rows(self._grid, self._width),
+            self._entry,
+            self._exit,
+            path,
+        )
+
+    def write_stream(self, path: str | None = None) -> None:
+        """
+        Generate the maze with Eller's algorithm straight into the output
+        file
+
+        Rows are written as soon as they are final, so memory use is
+        O(width) whatever the height and the grid is never built. The
+        maze is the one generate() builds with the eller algorithm and
+        the same seed. Only the text format can be streamed.
+
+        :param path: Solution path to write after the exit, if known
+        """
+        if self._output is None:
+            raise ValueError("Output file not set")
+        if Path(self._output).suffix == ".mzb":
+            raise ValueError("Streaming writes the text format only")
+        assert self._width is not None
+        assert self._height is not None
+        blocked = checked_p42_mask(self)
+        self._rng.seed(self._seed)
+        rows = eller_rows(self._width, self._height, self._rng, blocked)
+        if not self._perfect:
+            rows = imperfect_rows(
+                rows, self._width, self._height, blocked, self._rng
+            )
+        write_maze(self._output, rows, self._entry, self._exit, path)
+
+    def generate(
+        self, observer: Observer | None = None, batch: int = BATCH
+    ) -> None:
+        """
+        Generate the maze with the configured algorithm
+
+        :param observer: Called during generation with the carve events
+            of every ``batch`` carves (see grid.Observer and
+            grid.apply_carves). The grid itself is only updated at the end.
+        :param batch: Number of carves per observer call
+        """
+        self._check_stream()
+        engine = ALGORITHMS.get(self._algorithm or "dfs")
+        if engine is None:
+            raise ValueError(f"Unknown algorithm: {self._algorithm}")
+        self._rng.seed(self._seed)
+        engine(self, self._rng, observer=observer, batch=batch)
+
+    def steps(
+        self, every: int = BATCH, state: GenState | None = None
+    ) -> Iterator[list[int]]:
+        """
+        Generate the maze step by step with the configured algorithm
+        (dfs or hak)
+
+        Returns a generator yielding the carve events of about every
+        ``every`` carves; the grid is complete once it is exhausted. Pass
+        an empty GenState to save() snapshots between steps, or a loaded
+        one to resume (the grid must be reset, the saved cells replace it).
+
+        :param every: Number of carves per step
+        :param state: Generation state, see dfs_steps()
+        """
+        if self._algorithm not in (None, "dfs", "hak"):
+            raise ValueError(f"steps() is not available for {self._algorithm}")
+        if state is None or not state.started:
+            self._rng.seed(self._seed)
+        if self._algorithm == "hak":
+            return hak_steps(self, self._rng, every, state)
+        return dfs_steps(self, self._rng, every, state)
+
+    def seed_output(self, seed: int) -> Path:
+        """
+        Output path used for one seed of a batch: out.txt -> out_<seed>.txt
+        """
+        if self._output is None:
+            raise ValueError("Output file not set")
+        path = Path(self._output)
+        return path.with_name(f"{path.stem}_{seed}{path.suffix}")
+
+    def _batch(self) -> "MazeGenerator":
+        if self._width is None or self._height is None:
+            raise ValueError("Width/height not set")
+        template = copy(self)
+        template._grid = None
+        template._rng = Random()
+        return template
+
+    def generate_many(
+        self, seeds: Iterable[int], workers: int | None = None
+    ) -> list[Grid]:
+        """
+        Generate one maze per seed with the current settings
+
+        Work is spread over a process pool of ``workers`` processes
+        (default: one per CPU, 1 runs in this process). Grids are returned
+        in seed order and do not depend on the number of workers.
+        """
+        self._check_stream()
+        return self._run_many(_generate_seed, seeds, workers)
+
+    def write_many(
+        self, seeds: Iterable[int], workers: int | None = None
+    ) -> list[Path]:
+        """
+        Like generate_many() but each maze is written by its worker to
+        seed_output(seed) instead of being returned. Paths are returned in
+        seed order.
+        """
+        self._check_stream()
+        return self._run_many(_write_seed, seeds, workers)
+
+    def _run_many(
+        self,
+        worker: Callable[["MazeGenerator", int], T],
+        seeds: Iterable[int],
+        workers: int | None,
+    ) -> list[T]:
+        template = self._batch()
+        jobs = list(seeds)
+        workers = workers or cpu_count() or 1
+        if workers == 1 or len(jobs) <= 1:
+            return [worker(template, seed) for seed in jobs]
+        chunk = max(1, len(jobs) // (4 * workers))
+        with ProcessPoolExecutor(workers) as pool:
+            return list(pool.map(partial(worker, template), jobs,
+                                 chunksize=chunk))
 
     def reset(self) -> None:
         if self._width is None or self._height is None:
             raise ValueError("Width/height not set")
-        i_width = range(self._width)
-        i_height = range(self._height)
-        self._grid = [[15 for _ in i_width] for _ in i_height]
+        if self._stream:
+            return
+        self._grid = new_grid(self._width, self._height, self._compact)
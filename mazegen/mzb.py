@@ -0,0 +1,210 @@
+"""
+Compact binary maze format (.mzb).
+
+Layout (little-endian)::
+
+    header   64 bytes, see HEADER
+    cells    ceil(width * height / 2) bytes, two cells per byte; the
+             even cell in the low nibble, the odd cell in the high nibble
+    path     ceil(steps / 4) bytes, 2 bits per step (N=0, E=1, S=2, W=3),
+             the first step in the lowest bits
+
+Packing and unpacking never loop over cells in Python: nibbles and path
+steps are split and merged with ``bytes.translate``, strided slices and
+big integer ``|``.
+"""
+
+from __future__ import annotations
+from struct import Struct
+from typing import TYPE_CHECKING, Union
+
+if TYPE_CHECKING:
+    from .loader import MazeData
+
+MAGIC = b"MZB1"
+HEADER = Struct("<4sBBHIIIIIIQQ16s")
+PERFECT = 0x01
+HAS_SEED = 0x02
+HAS_ENTRY = 0x04
+HAS_EXIT = 0x08
+HAS_PATH = 0x10
+
+_LOW = bytes(v & 0x0F for v in range(256))
+_HIGH = bytes(v >> 4 for v in range(256))
+_TO_HIGH = bytes((v & 0x0F) << 4 for v in range(256))
+_STEP_CODES = bytes.maketrans(b"NESWnesw", b"\x00\x01\x02\x03" * 2)
+_STEP_NAMES = bytes.maketrans(b"\x00\x01\x02\x03", b"NESW")
+_SHIFT_IN = [bytes((v & 3) << (2 * k) for v in range(256)) for k in range(4)]
+_SHIFT_OUT = [bytes((v >> (2 * k)) & 3 for v in range(256)) for k in range(4)]
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+def pack_cells(cells: Buffer) -> bytes:
+    """
+    Pack wall values two per byte
+
+    :param cells: Wall values (0-15) in row-major order
+    """
+    data = bytes(cells)
+    if len(data) % 2:
+        data += b"\x00"
+    size = len(data) // 2
+    low = int.from_bytes(data[0::2].translate(_LOW), "little")
+    high = int.from_bytes(data[1::2].translate(_TO_HIGH), "little")
+    return (low | high).to_bytes(size, "little")
+
+
+def unpack_cells(packed: Buffer, count: int) -> bytearray:
+    """
+    Unpack nibble-packed wall values
+
+    :param packed: Packed cells
+    :param count: Number of cells
+    """
+    data = bytes(packed)
+    cells = bytearray(len(data) * 2)
+    cells[0::2] = data.translate(_LOW)
+    cells[1::2] = data.translate(_HIGH)
+    del cells[count:]
+    return cells
+
+
+def pack_path(path: str) -> bytes:
+    """
+    Pack a N/E/S/W path with 2 bits per step
+
+    :param path: Path as string of directions
+    """
+    codes = path.encode().translate(_STEP_CODES)
+    codes += b"\x00" * (-len(codes) % 4)
+    size = len(codes) // 4
+    packed = 0
+    for k in range(4):
+        lane = codes[k::4].translate(_SHIFT_IN[k])
+        packed |= int.from_bytes(lane, "little")
+    return packed.to_bytes(size, "little")
+
+
+def unpack_path(packed: Buffer, steps: int) -> str:
+    """
+    Unpack a 2 bit per step path
+
+    :param packed: Packed path
+    :param steps: Number of steps
+    """
+    data = bytes(packed)
+    codes = bytearray(len(data) * 4)
+    for k in range(4):
+        codes[k::4] = data.translate(_SHIFT_OUT[k])
+    del codes[steps:]
+    return codes.translate(_STEP_NAMES).decode()
+
+
+def encode_mzb(
+    cells: Buffer,
+    width: int,
+    height: int,
+    entry: tuple[int, int] | None = None,
+    exit: tuple[int, int] | None = None,
+    seed: int | None = None,
+    algorithm: str | None = None,
+    perfect: bool | None = None,
+    path: str | None = None,
+) -> bytes:
+    """
+    Encode a maze in the binary format
+
+    :param cells: Wall values in row-major order
+    :param width: Number of columns
+    :param height: Number of rows
+    :param entry: Entry coordinates (x, y)
+    :param exit: Exit coordinates (x, y)
+    :param seed: Seed the maze was generated with
+    :param algorithm: Name of the generation algorithm
+    :param perfect: Perfect maze flag
+    :param path: Solution path (N/E/S/W)
+    """
+    if len(cells) != width * height:
+        raise ValueError("Cell count does not match width x height")
+    flags = 0
+    if perfect:
+        flags |= PERFECT
+    if seed is not None:
+        flags |= HAS_SEED
+    if entry is not None:
+        flags |= HAS_ENTRY
+    if exit is not None:
+        flags |= HAS_EXIT
+    if path is not None:
+        flags |= HAS_PATH
+    ex, ey = entry or (0, 0)
+    xx, xy = exit or (0, 0)
+    steps = len(path) if path is not None else 0
+    header = HEADER.pack(
+        MAGIC,
+        1,
+        flags,
+        0,
+        width,
+        height,
+        ex,
+        ey,
+        xx,
+        xy,
+        seed or 0,
+        steps,
+        (algorithm or "").encode()[:16],
+    )
+    return header + pack_cells(cells) + pack_path(path or "")
+
+
+def parse_mzb(data: Buffer) -> MazeData:
+    """
+    Decode a maze in the binary format
+
+    The header is unpacked in place and the cell and path sections are
+    sliced through a memoryview, so only the unpacked output is copied.
+
+    :param data: File contents
+    """
+    view = memoryview(data)
+    if len(view) < HEADER.size:
+        raise ValueError("Truncated .mzb header")
+    (
+        magic,
+        version,
+        flags,
+        _,
+        width,
+        height,
+        ex,
+        ey,
+        xx,
+        xy,
+        seed,
+        steps,
+        algorithm,
+    ) = HEADER.unpack_from(view)
+    if magic != MAGIC or version != 1:
+        raise ValueError("Not a .mzb v1 file")
+    count = width * height
+    cells_end = HEADER.size + (count + 1) // 2
+    path_end = cells_end + (steps + 3) // 4
+    if len(view) < path_end:
+        raise ValueError("Truncated .mzb data")
+    return {
+        "cells": unpack_cells(view[HEADER.size:cells_end], count),
+        "width": width,
+        "height": height,
+        "entry": (ex, ey) if flags & HAS_ENTRY else None,
+        "exit": (xx, xy) if flags & HAS_EXIT else None,
+        "path": (
+            unpack_path(view[cells_end:path_end], steps)
+            if flags & HAS_PATH
+            else None
+        ),
+        "seed": seed if flags & HAS_SEED else None,
+        "algorithm": algorithm.rstrip(b"\x00").decode() or None,
+        "perfect": bool(flags & PERFECT),
+    }
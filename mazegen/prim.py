@@ -0,0 +1,94 @@
+"""
+Maze generator using randomized Prim's algorithm.
+
+The maze grows from the entry: a random wall is taken from the frontier
+(walls between the maze and a cell outside it) and removed if the cell
+behind it is still outside, whose walls then join the frontier. Walls are
+removed from the frontier by swapping with the last one, in O(1).
+"""
+
+from __future__ import annotations
+from random import Random
+from typing import TYPE_CHECKING
+from .mask_42 import checked_p42_mask
+from .imperfect import make_imperfect
+from .grid import BATCH, Observer, flatten, notify, padded_mask, store
+
+if TYPE_CHECKING:
+    from .mazegen import MazeGenerator
+
+
+def prim(
+    maze: MazeGenerator,
+    rng: Random | None = None,
+    observer: Observer | None = None,
+    batch: int = BATCH,
+) -> None:
+    """
+    Randomized Prim algorithm used by the MazeGenerator class
+
+    :param maze: MazeGenerator class
+    :param rng: Random number generator, seeded from maze.seed if None
+    :param observer: Called with the carve events of every batch carves
+    :param batch: Number of carves per observer call
+    """
+    assert maze.entry is not None
+    assert maze.height is not None
+    assert maze.width is not None
+    assert maze.grid is not None
+
+    blocked = checked_p42_mask(maze)
+    if rng is None:
+        rng = Random(maze.seed)
+    randrange = rng.randrange
+    width = maze.width
+    height = maze.height
+    cells = flatten(maze.grid)
+
+    # Same padded visited bitmap as dfs(); frontier walls are stored as
+    # padded index << 2 | direction
+    stride = width + 2
+    visited = padded_mask(width, height, blocked)
+    ex, ey = maze.entry
+    start = (ex + 1) * stride + ey + 1
+    visited[start] = 1
+    step = [-stride, 1, stride, -1]
+    cell_step = [-width, 1, width, -1]
+    wall = [~1, ~2, ~4, ~8]
+    opposite_wall = [~4, ~8, ~1, ~2]
+    frontier = [
+        start << 2 | d for d in range(4) if not visited[start + step[d]]
+    ]
+    carved: list[int] = []
+    log = None if observer is None else carved.append
+    countdown = batch
+    while frontier:
+        k = randrange(len(frontier))
+        edge = frontier.pop()
+        if k < len(frontier):
+            frontier[k], edge = edge, frontier[k]
+        i = edge >> 2
+        d = edge & 3
+        n = i + step[d]
+        if visited[n]:
+            continue
+        visited[n] = 1
+        c = i - stride + 1 - 2 * (i // stride)
+        cells[c] &= wall[d]
+        cells[c + cell_step[d]] &= opposite_wall[d]
+        if log is not None:
+            log(c << 2 | d)
+            countdown -= 1
+            if not countdown:
+                notify(observer, carved)
+                countdown = batch
+        for d in range(4):
+            if not visited[n + step[d]]:
+                frontier.append(n << 2 | d)
+    store(maze.grid, cells, width)
+    notify(observer, carved)
+
+    if not maze.perfect:
+        make_imperfect(
+            maze, blocked, rng=rng, observer=observer, batch=batch
+        )
@@ -0,0 +1,102 @@
+"""
+Resumable generation state.
+
+The step generators (dfs_steps(), hak_steps()) keep their stack, visited
+cells and random generator in a GenState instead of plain locals. These
+objects are updated in place while the generator runs, so at any point
+where the generator has yielded the state can be pickled to disk and later
+passed back to resume the generation exactly where it stopped.
+"""
+
+from __future__ import annotations
+from os import PathLike, fdopen, replace, unlink
+from pathlib import Path
+from pickle import HIGHEST_PROTOCOL, dump, load
+from random import Random
+from tempfile import mkstemp
+from typing import Union
+
+
+class GenState:
+    """
+    Progress of a step generator
+
+    Create an empty state and pass it to a step generator to be able to
+    save it, or pass a loaded one to resume. Only the fields of the
+    algorithm in use are filled in.
+    """
+
+    def __init__(self) -> None:
+        self.algorithm = ""
+        self.width = 0
+        self.height = 0
+        self.cells = bytearray()
+        self.rng = Random()
+        # Set once the grid is final, imperfect pass included
+        self.done = False
+        # dfs and hak: padded visited bitmap (see grid.padded_mask())
+        self.visited = bytearray()
+        # dfs: stack of padded indices and the direction order, which
+        # shuffle() permutes in place
+        self.stack: list[int] = []
+        self.order = [0, 1, 2, 3]
+        # hak: unvisited cells per row, hunt cursor and the cell the
+        # next kill phase starts from
+        self.remaining: list[int] = []
+        self.cursor = 0
+        self.at = (0, 0)
+
+    @property
+    def started(self) -> bool:
+        return bool(self.algorithm)
+
+    def check(self, algorithm: str, width: int, height: int) -> None:
+        """
+        Raise if the state was saved from another kind of maze
+
+        :param algorithm: Algorithm resuming the state
+        :param width: Number of columns of the maze
+        :param height: Number of rows of the maze
+        """
+        if (self.algorithm, self.width, self.height) != (
+            algorithm,
+            width,
+            height,
+        ):
+            raise ValueError(
+                f"Saved state is a {self.width}x{self.height} "
+                f"{self.algorithm} maze, not {width}x{height} {algorithm}"
+            )
+
+    def save(self, file: Union[str, PathLike[str]]) -> None:
+        """
+        Write the state to a file
+
+        The state is written to a temporary file of its own next to the
+        snapshot and renamed, so an interruption while saving leaves the
+        previous snapshot intact and concurrent saves to the same path
+        do not share a temporary file.
+
+        :param file: Snapshot file
+        """
+        fd, tmp = mkstemp(dir=Path(file).parent, suffix=".tmp")
+        try:
+            with fdopen(fd, "wb") as fp:
+                dump(self, fp, protocol=HIGHEST_PROTOCOL)
+            replace(tmp, file)
+        except BaseException:
+            unlink(tmp)
+            raise
+
+    @staticmethod
+    def load(file: Union[str, PathLike[str]]) -> GenState:
+        """
+        Read a state written by save()
+
+        :param file: Snapshot file
+        """
+        with open(file, "rb") as fp:
+            state = load(fp)
+        if not isinstance(state, GenState):
+            raise ValueError(f"{file} is not a generation snapshot")
+        return state
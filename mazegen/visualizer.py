@@ -5,15 +5,51 @@ This will display the maze to stdout
 Ref: https://gist.github.com/fnky/458719343aabd01cfb17a3a4f7296797
 """
 
-from os import PathLike
-from typing import Union, Any
+from __future__ import annotations
+from collections import OrderedDict
+from contextlib import contextmanager
+from os import PathLike, close, pipe, read, set_blocking, write
+from typing import TYPE_CHECKING, Iterable, Iterator, Union, Any
 from enum import IntEnum
 from shutil import get_terminal_size
 from sys import stdout, stdin
 from select import select
+from signal import SIGWINCH, signal
 from termios import tcgetattr, tcsetattr, TCSADRAIN
 from tty import setcbreak
-from time import sleep
+from time import monotonic
+from types import FrameType
+from .grid import Observer, apply_carves, flatten
+from .loader import Cells, MappedGrid, load_maze
+from .mask_42 import p42_cells
+
+if TYPE_CHECKING:
+    from .mazegen import MazeGenerator
+
+# Wall glyph codes used while building a line of the wall buffer:
+# 0 blank, 1..15 junction by mask (1 up, 2 right, 4 down, 8 left),
+# 16 horizontal wall, 17 vertical wall
+_GLYPHS = dict(enumerate(" ╵╶╰╷│╭├╴╯─┴╮┤┬┼─│"))
+_WEST = bytes(17 if v & 8 else 0 for v in range(256))
+_EAST = bytes(17 if v & 2 else 0 for v in range(256))
+_NORTH = bytes(16 if v & 1 else 0 for v in range(256))
+_SOUTH = bytes(16 if v & 4 else 0 for v in range(256))
+_UP = bytes.maketrans(b"\x11", b"\x01")
+_DOWN = bytes.maketrans(b"\x11", b"\x04")
+_RIGHT = bytes.maketrans(b"\x10", b"\x02")
+_LEFT = bytes.maketrans(b"\x10", b"\x08")
+# Columns per cached block of a wall line (even, so that every block
+# starts on a junction column) and number of blocks kept
+_BLOCK = 256
+_CACHED = 4096
+
+
+def _merge(*parts: bytes) -> bytes:
+    """Bitwise OR of equally long byte strings."""
+    value = 0
+    for part in parts:
+        value |= int.from_bytes(part, "little")
+    return value.to_bytes(len(parts[0]), "little")
 
 
 class Point:
@@ -127,21 +163,43 @@ class Visualizer:
             tcsetattr(stdin.fileno(), TCSADRAIN, old)
 
         @staticmethod
-        def get_key() -> str | None:
-            """Get a single keypress without blocking.
+        def get_key(
+            timeout: float | None = 0, wake: int | None = None
+        ) -> str | None:
+            """Wait for a single keypress.
+
+            Bytes are read straight from the file descriptor, so no key
+            can sit unseen in a Python buffer while select() waits.
+
+            Args:
+                timeout: Seconds to wait, 0 to poll, None to block.
+                wake: File descriptor that interrupts the wait when it
+                    becomes readable (its data is drained).
 
             Returns:
                 Key character or special key name
-                ('up', 'down', 'left', 'right'),
-                or None if no key pressed.
+                ('up', 'down', 'left', 'right'), 'wake' if woken up
+                through wake, 'eof' if stdin is closed, or None if
+                no key was pressed in time.
             """
-            dr, _, _ = select([stdin], [], [], 0)
+            fd = stdin.fileno()
+            fds = [fd] if wake is None else [fd, wake]
+            dr, _, _ = select(fds, [], [], timeout)
             if not dr:
                 return None
-            ch = stdin.read(1)
+            if wake is not None and wake in dr:
+                read(wake, 512)
+                return "wake"
+
+            def getch() -> str:
+                return read(fd, 1).decode(errors="replace")
+
+            ch = getch()
+            if not ch:
+                return "eof"
             if ch == "\x1b":
-                ch1 = stdin.read(1)
-                ch2 = stdin.read(1)
+                ch1 = getch()
+                ch2 = getch()
                 if ch1 == "[":
                     if ch2 == "A":
                         return "up"
@@ -268,9 +326,149 @@ class Visualizer:
             """Exit alternate screen buffer and restore original."""
             stdout.write("\x1b[?1049l")
 
+    class Screen:
+        """Last frame sent to the terminal, to send only what changed.
+
+        A frame is a list of lines, each a list of cells (one character,
+        or a grapheme such as an emoji) with a parallel list of colors
+        (0 for the default color).
+        """
+
+        # Unchanged cells shorter than this between two changed runs are
+        # resent rather than paying for another cursor move
+        GAP = 8
+
+        def __init__(self) -> None:
+            """Initialize with no frame on the terminal."""
+            self.chars: list[list[str]] = []
+            self.colors: list[list[int]] = []
+
+        def reset(self) -> None:
+            """Forget the last frame; the next update redraws everything."""
+            self.chars = []
+            self.colors = []
+
+        def scroll(self, lines: int, rows: int) -> str:
+            """Scroll the top rows of the last frame.
+
+            Uses an ANSI scroll region so the terminal moves the lines
+            itself; the next update() then only fills in the exposed
+            line and whatever else changed.
+
+            Args:
+                lines: Lines to scroll, positive moves the content up.
+                rows: Height of the scrolled region from the top.
+
+            Returns:
+                Escape sequence to send, empty if nothing is on screen.
+            """
+            if not self.chars or not lines or abs(lines) >= rows:
+                return ""
+            width = len(self.chars[0])
+            n = abs(lines)
+            chars = [[" "] * width for _ in range(n)]
+            colors = [[0] * width for _ in range(n)]
+            if lines > 0:
+                self.chars[:rows] = self.chars[n:rows] + chars
+                self.colors[:rows] = self.colors[n:rows] + colors
+                code = "S"
+            else:
+                self.chars[:rows] = chars + self.chars[:rows - n]
+                self.colors[:rows] = colors + self.colors[:rows - n]
+                code = "T"
+            return f"\x1b[0m\x1b[1;{rows}r\x1b[{n}{code}\x1b[r"
+
+        def shift(self, columns: int, rows: int) -> str:
+            """Shift the top rows of the last frame sideways.
+
+            Deletes (content moves left) or inserts (content moves right)
+            characters at the start of each line, so the terminal moves
+            the rest of the line itself.
+
+            Args:
+                columns: Columns to shift, positive moves the content left.
+                rows: Number of lines from the top to shift.
+
+            Returns:
+                Escape sequence to send, empty if nothing is on screen.
+            """
+            if not self.chars or not columns:
+                return ""
+            width = len(self.chars[0])
+            n = abs(columns)
+            if n >= width:
+                return ""
+            code = "P" if columns > 0 else "@"
+            parts = ["\x1b[0m"]
+            for y in range(min(rows, len(self.chars))):
+                parts.append(f"\x1b[{y + 1};1H\x1b[{n}{code}")
+                if columns > 0:
+                    self.chars[y] = self.chars[y][n:] + [" "] * n
+                    self.colors[y] = self.colors[y][n:] + [0] * n
+                else:
+                    self.chars[y] = [" "] * n + self.chars[y][:-n]
+                    self.colors[y] = [0] * n + self.colors[y][:-n]
+            return "".join(parts)
+
+        def update(
+            self, chars: list[list[str]], colors: list[list[int]]
+        ) -> str:
+            """Build the output turning the last frame into this one.
+
+            Lines are compared whole first; in a changed line only the
+            runs of changed cells are sent, each after one cursor move.
+            A frame of another size clears the screen and is sent whole.
+
+            Args:
+                chars: Cells of the new frame.
+                colors: Color of every cell of the new frame.
+
+            Returns:
+                Escape sequences and text to send in one write.
+            """
+            parts: list[str] = []
+            if (
+                len(chars) != len(self.chars)
+                or chars and len(chars[0]) != len(self.chars[0])
+            ):
+                parts.append("\x1b[0m\x1b[2J")
+                self.chars = [[" "] * len(row) for row in chars]
+                self.colors = [[0] * len(row) for row in chars]
+            current = -1
+            for y, (line, hues) in enumerate(zip(chars, colors)):
+                old = self.chars[y]
+                old_hues = self.colors[y]
+                if line == old and hues == old_hues:
+                    continue
+                width = len(line)
+                x = 0
+                while x < width:
+                    if line[x] == old[x] and hues[x] == old_hues[x]:
+                        x += 1
+                        continue
+                    start = x
+                    end = x + 1
+                    while x < width and x - end < self.GAP:
+                        if line[x] != old[x] or hues[x] != old_hues[x]:
+                            end = x + 1
+                        x += 1
+                    parts.append(f"\x1b[{y + 1};{start + 1}H")
+                    for i in range(start, end):
+                        if hues[i] != current:
+                            current = hues[i]
+                            parts.append(f"\x1b[{current}m")
+                        parts.append(line[i])
+                self.chars[y] = line[:]
+                self.colors[y] = hues[:]
+            if current > 0:
+                parts.append("\x1b[0m")
+            return "".join(parts)
+
     def __init__(self) -> None:
         """Initialize visualizer with default settings."""
-        self.maze: list[list[Cell]]
+        self.cells: Cells
+        self.cols: int
+        self.rows: int
         self.start: Point
         self.end: Point
         self.path: list[str]
@@ -281,30 +479,284 @@ class Visualizer:
         self.logo_color: Graphics.Color = Graphics.Color.Yellow
         self.path_symbol: str = "░"
         self.path_drawn = False
-
-    def read(self, file: Union[str, PathLike[str]]) -> None:
+        self._glyphs: OrderedDict[tuple[int, int], str] = OrderedDict()
+        self._trail: list[tuple[int, int]] = []
+        self._trail_rows: dict[int, list[int]] = {}
+        self._logo_rows: dict[int, list[int]] = {}
+
+    def read(
+        self, file: Union[str, PathLike[str]], mapped: bool = False
+    ) -> None:
         """Load maze from output file.
 
         Args:
             file: Path to maze file containing grid, entry, exit, and path.
+            mapped: Map the file with MappedGrid instead of loading it;
+                rendering then only reads the rows inside the viewport.
         """
-        maze: list[list[Cell]] = []
-        with open(file, "r") as fp:
-            for y, ln in enumerate(fp):
-                if ln == "\n":
-                    break
-                maze.append(
-                    [Cell(x, y, int(c, 16)) for x, c in enumerate(ln.strip())]
-                )
-            start = Point(*(int(x) for x in fp.readline().strip().split(",")))
-            end = Point(*(int(x) for x in fp.readline().strip().split(",")))
-            path = [c.upper() for c in fp.readline().strip()]
-        self.maze = maze
+        if mapped:
+            grid = MappedGrid(file)
+            if grid.entry is None or grid.exit is None:
+                raise ValueError(f"Missing entry or exit in {file}")
+            self._set(
+                grid,
+                grid.width,
+                Point(*grid.entry),
+                Point(*grid.exit),
+                list(grid.path or ""),
+            )
+            return
+        data = load_maze(file)
+        if data["entry"] is None or data["exit"] is None:
+            raise ValueError(f"Missing entry or exit in {file}")
+        self._set(
+            data["cells"],
+            data["width"],
+            Point(*data["entry"]),
+            Point(*data["exit"]),
+            list(data["path"] or ""),
+        )
+
+    def load(self, maze: MazeGenerator, path: str | None = None) -> None:
+        """Load a generated maze directly, without reading the output file.
+
+        Args:
+            maze: Generated maze providing grid, entry and exit.
+            path: Solution path as N/E/S/W string, if any.
+        """
+        assert maze.grid is not None
+        assert maze.width is not None
+        assert maze.entry is not None
+        assert maze.exit is not None
+        self._set(
+            flatten(maze.grid),
+            maze.width,
+            Point(*maze.entry),
+            Point(*maze.exit),
+            list(path or ""),
+        )
+
+    @contextmanager
+    def watch(
+        self, maze: MazeGenerator, fps: float = 30.0
+    ) -> Iterator[Observer]:
+        """Animate the generation of a maze.
+
+        Carve events are replayed on a grid with every wall closed and
+        only the glyph lines of the rows they touch are rebuilt. Frames
+        of the top-left viewport are sent through a Screen diff at most
+        ``fps`` times a second, however small the batches are; uncarved
+        cells are drawn as solid blocks.
+
+        Used as a context manager around the generation: the alternate
+        screen is left and the cursor shown again when the block exits,
+        also when the generation raises or is interrupted.
+
+        Args:
+            maze: Maze about to be generated, size, entry and exit set.
+            fps: Maximum number of frames per second.
+
+        Yields:
+            Observer to pass to MazeGenerator.generate().
+        """
+        assert maze.width is not None
+        assert maze.height is not None
+        assert maze.entry is not None
+        assert maze.exit is not None
+        cols = maze.width
+        cells = bytearray(b"\x0f") * (cols * maze.height)
+        self._set(cells, cols, Point(*maze.entry), Point(*maze.exit), [])
+        screen = Visualizer.Screen()
+        term = Visualizer.Terminal()
+        interval = 1.0 / fps
+        next_frame = 0.0
+
+        def frame() -> None:
+            term.update()
+            view_w = max(1, term.width)
+            view_h = max(1, term.height)
+            chars = [[" "] * view_w for _ in range(view_h)]
+            colors = [[0] * view_w for _ in range(view_h)]
+            wall = int(self.wall_color)
+            for i in range(min(view_h, self.rows * 2 + 1)):
+                line = self._glyph_row(i, 0, view_w)
+                chars[i][:len(line)] = line
+                colors[i][:len(line)] = [wall] * len(line)
+            logo = int(self.logo_color)
+            shown = min(cols, view_w // 2)
+            for y in range(min(self.rows, view_h // 2)):
+                row = bytes(cells[y * cols:y * cols + shown])
+                x = row.find(15)
+                while x >= 0:
+                    chars[y * 2 + 1][x * 2 + 1] = "█"
+                    colors[y * 2 + 1][x * 2 + 1] = logo
+                    x = row.find(15, x + 1)
+            stdout.write(screen.update(chars, colors))
+            stdout.flush()
+
+        def observer(events: list[int]) -> None:
+            nonlocal next_frame
+            apply_carves(cells, cols, events)
+            self._forget_rows({(event >> 2) // cols for event in events})
+            now = monotonic()
+            if now >= next_frame:
+                next_frame = now + interval
+                frame()
+
+        Visualizer.Terminal.enter_alternate()
+        Visualizer.Cursor.hide()
+        try:
+            yield observer
+        finally:
+            Visualizer.Cursor.show()
+            Visualizer.Terminal.exit_alternate()
+            stdout.flush()
+
+    def _set(
+        self,
+        cells: Cells,
+        cols: int,
+        start: Point,
+        end: Point,
+        path: list[str],
+    ) -> None:
+        """Store loaded maze data.
+
+        Args:
+            cells: Wall bit flags in row-major order.
+            cols: Number of maze columns.
+            start: Entry point.
+            end: Exit point.
+            path: Solution path directions.
+        """
+        self.cells = cells
+        self.cols = cols
+        self.rows = len(cells) // cols if cols else 0
         self.start = start
         self.end = end
         self.path = path
-        self.width = len(maze[0]) * 3
-        self.height = len(maze) * 3
+        self.width = self.cols * 3
+        self.height = self.rows * 3
+        self._glyphs = OrderedDict()
+        self._trail = []
+        self._trail_rows = {}
+        moves = {"N": (0, -1), "E": (1, 0), "S": (0, 1), "W": (-1, 0)}
+        x = start.x * 2 + 1
+        y = start.y * 2 + 1
+        for c in path:
+            dx, dy = moves.get(c, (0, 0))
+            for _ in range(2):
+                x += dx
+                y += dy
+                self._trail.append((x, y))
+        for x, y in self._trail:
+            self._trail_rows.setdefault(y, []).append(x)
+        self._logo_rows = {}
+        for x, y in p42_cells(self.cols, self.rows):
+            self._logo_rows.setdefault(x, []).append(y)
+
+    def _glyph_row(self, i: int, x0: int = 0, x1: int | None = None) -> str:
+        """Columns x0..x1-1 of line i of the wall and junction buffer.
+
+        Odd lines cross a row of cells, even lines run between two rows
+        of cells and hold the horizontal walls and junctions. Lines are
+        cut into blocks of _BLOCK columns, built on first use and kept
+        in a bounded LRU, so only the columns ever shown are read from
+        the maze and the buffer stays small on huge (mapped) mazes.
+
+        Args:
+            i: Line index, 0..2 * rows.
+            x0: First column.
+            x1: End column, clipped to 2 * cols + 1 (default: line end).
+
+        Returns:
+            The requested part of the line.
+        """
+        end = self.cols * 2 + 1
+        x1 = end if x1 is None else min(x1, end)
+        if x0 >= x1:
+            return ""
+        first = x0 // _BLOCK
+        last = (x1 - 1) // _BLOCK
+        line = "".join(
+            self._glyph_block(i, k) for k in range(first, last + 1)
+        )
+        return line[x0 - first * _BLOCK:x1 - first * _BLOCK]
+
+    def _glyph_block(self, i: int, k: int) -> str:
+        """Block k of line i of the wall buffer, see _glyph_row().
+
+        The block is built from the cells under it plus one neighbour on
+        each side, with a few translate and OR operations, and cached
+        until another maze is set.
+
+        Args:
+            i: Line index, 0..2 * rows.
+            k: Block index; block k holds columns k * _BLOCK onwards.
+
+        Returns:
+            Up to _BLOCK characters of the line.
+        """
+        glyphs = self._glyphs
+        line = glyphs.get((i, k))
+        if line is not None:
+            glyphs.move_to_end((i, k))
+            return line
+        w = self.cols
+        cells = self.cells
+        c0 = k * _BLOCK
+        c1 = min(c0 + _BLOCK, w * 2 + 1)
+        # Cells x0..x1-1; index t of a span is cell x0 + t and column c
+        # of the line is index c - 2 * x0 of the codes
+        x0 = c0 // 2 - 1
+        x1 = c1 // 2 + 1
+
+        def maze_row(y: int) -> bytes:
+            """Walls of cells x0..x1-1 of maze row y, 0 outside the maze."""
+            if not 0 <= y < self.rows:
+                return bytes(x1 - x0)
+            a = max(x0, 0)
+            b = min(x1, w)
+            row = bytes(cells[y * w + a:y * w + b])
+            return bytes(a - x0) + row + bytes(x1 - b)
+
+        def vertical(row: bytes) -> bytes:
+            return _merge(
+                row.translate(_WEST) + b"\0", b"\0" + row.translate(_EAST)
+            )
+
+        codes = bytearray((x1 - x0) * 2 + 1)
+        if i % 2:
+            codes[0::2] = vertical(maze_row(i // 2))
+        else:
+            above = maze_row(i // 2 - 1)
+            below = maze_row(i // 2)
+            horizontal = _merge(
+                below.translate(_NORTH), above.translate(_SOUTH)
+            )
+            codes[1::2] = horizontal
+            codes[0::2] = _merge(
+                vertical(above).translate(_UP),
+                (horizontal + b"\0").translate(_RIGHT),
+                vertical(below).translate(_DOWN),
+                (b"\0" + horizontal).translate(_LEFT),
+            )
+        line = (
+            codes[c0 - 2 * x0:c1 - 2 * x0].decode("latin-1").translate(_GLYPHS)
+        )
+        glyphs[(i, k)] = line
+        if len(glyphs) > _CACHED:
+            glyphs.popitem(last=False)
+        return line
+
+    def _forget_rows(self, rows: Iterable[int]) -> None:
+        """Drop the cached glyph blocks next to the given maze rows."""
+        blocks = range(self.cols * 2 // _BLOCK + 1)
+        glyphs = self._glyphs
+        for y in rows:
+            for i in range(y * 2, y * 2 + 3):
+                for k in blocks:
+                    glyphs.pop((i, k), None)
 
     def render(self) -> tuple[bool, int | None]:
         """Render and interact with maze visualization.
@@ -315,13 +767,11 @@ class Visualizer:
         """
         term = Visualizer.Terminal()
         cursor = Visualizer.Cursor()
-        N = 0b0001
-        E = 0b0010
-        S = 0b0100
-        W = 0b1000
-        m_h = len(self.maze)
-        m_w = len(self.maze[0])
-        out = [[" " for _ in range(m_w * 2 + 1)] for _ in range(m_h * 2 + 1)]
+        m_h = self.rows
+        m_w = self.cols
+        # Size of the character grid: walls and junctions between cells
+        out_h = m_h * 2 + 1
+        out_w = m_w * 2 + 1
 
         # Viewport offsets (top-left corner in `out`)
         off_x = 0
@@ -333,8 +783,6 @@ class Visualizer:
 
         def clamp_offsets() -> None:
             nonlocal off_x, off_y
-            out_h = len(out)
-            out_w = len(out[0]) if out else 0
             max_off_x = max(0, out_w - view_w)
             max_off_y = max(0, out_h - view_h)
             if off_x < 0:
@@ -352,128 +800,118 @@ class Visualizer:
         def in_view(sx: int, sy: int) -> bool:
             return 0 <= sx < view_w and 0 <= sy < view_h
 
-        def _walls() -> None:
+        def put(
+            chars: list[list[str]],
+            colors: list[list[int]],
+            x: int,
+            y: int,
+            char: str,
+            color: int,
+        ) -> None:
             """
-            Render maze walls and junctions into `out` then print viewport.
+            Put a character at maze coordinates if it is in the viewport.
             """
-            checks = [
-                (-1, 0, "│"),
-                (0, 1, "─"),
-                (1, 0, "│"),
-                (0, -1, "─"),
-            ]
-            junction_map = {
-                1: "╵",
-                2: "╶",
-                3: "╰",
-                4: "╷",
-                5: "│",
-                6: "╭",
-                7: "├",
-                8: "╴",
-                9: "╯",
-                10: "─",
-                11: "┴",
-                12: "╮",
-                13: "┤",
-                14: "┬",
-                15: "┼",
-            }
-
-            # reset out
-            for i in range(len(out)):
-                for j in range(len(out[i])):
-                    out[i][j] = " "
-
-            for mi in range(m_h):
-                for mj in range(m_w):
-                    i = mi * 2 + 1
-                    j = mj * 2 + 1
-                    cell = self.maze[mi][mj].walls
-                    if cell & N:
-                        out[i - 1][j] = "─"
-                    if cell & S:
-                        out[i + 1][j] = "─"
-                    if cell & E:
-                        out[i][j + 1] = "│"
-                    if cell & W:
-                        out[i][j - 1] = "│"
-
-            for i in range(0, m_h * 2 + 1, 2):
-                for j in range(0, m_w * 2 + 1, 2):
-                    mask = 0
-                    for bit, (di, dj, char) in enumerate(checks):
-                        ni, nj = i + di, j + dj
-                        if 0 <= ni < len(out) and 0 <= nj < len(out[ni]):
-                            if out[ni][nj] == char:
-                                mask |= 1 << bit
-                    out[i][j] = junction_map.get(mask, " ")
-            Graphics.set(self.wall_color)
-            for row_i in range(off_y, min(off_y + view_h, len(out))):
-                stdout.write("".join(out[row_i][off_x:off_x + view_w]) + "\n")
-            Graphics.reset()
-
-        def _logo() -> None:
+            sx, sy = to_screen(x, y)
+            if in_view(sx, sy):
+                chars[sy][sx] = char
+                colors[sy][sx] = color
+
+        def compose(
+            drawn: int | None = None,
+        ) -> tuple[list[list[str]], list[list[int]]]:
             """
-            Render logo (filled cells with all walls) inside viewport.
+            Compose the frame: walls, logo, S, path, E and the menu.
+
+            Everything is clipped to the viewport. While the path is
+            being animated, only its first `drawn` cells are drawn and
+            E is left out.
             """
-            Graphics.set(self.logo_color)
-            for mi in range(m_h):
-                for mj in range(m_w):
-                    i = mi * 2 + 1
-                    j = mj * 2 + 1
-                    if self.maze[mi][mj].walls == 15:
-                        sx, sy = to_screen(j, i)
-                        if in_view(sx, sy):
-                            cursor.move_to(sx, sy)
-                            stdout.write("█")
-            Graphics.reset()
-
-        def _path(animate: bool = False) -> None:
+            height = max(term.height, view_h)
+            chars = [[" "] * view_w for _ in range(height)]
+            colors = [[0] * view_w for _ in range(height)]
+
+            wall = int(self.wall_color)
+            for i in range(off_y, min(off_y + view_h, out_h)):
+                line = self._glyph_row(i, off_x, off_x + view_w)
+                chars[i - off_y][:len(line)] = line
+                colors[i - off_y][:len(line)] = [wall] * len(line)
+
+            logo = int(self.logo_color)
+            for mi, cols in self._logo_rows.items():
+                for mj in cols:
+                    put(chars, colors, mj * 2 + 1, mi * 2 + 1, "█", logo)
+
+            sx = self.start.x * 2 + 1
+            sy = self.start.y * 2 + 1
+            put(chars, colors, sx, sy, "S", 0)
+            color = int(self.path_color)
+            if drawn is not None:
+                for x, y in self._trail[:drawn]:
+                    put(chars, colors, x, y, self.path_symbol, color)
+            else:
+                for y in range(off_y, off_y + view_h):
+                    for x in self._trail_rows.get(y, ()):
+                        put(chars, colors, x, y, self.path_symbol, color)
+                ex = self.end.x * 2 + 1
+                ey = self.end.y * 2 + 1
+                put(chars, colors, ex, ey, "E", 0)
+
+            footer = term.height - 3
+            if footer >= 0 and (self.width <= 18 or self.height <= 18):
+                msg = ["⚠️"] + list(" Info: Maze too small for the 42 pattern")
+                msg = msg[:view_w]
+                chars[footer][:len(msg)] = msg
+                yellow = int(Graphics.Color.Yellow)
+                colors[footer][:len(msg)] = [yellow] * len(msg)
+            if footer + 1 >= 0:
+                chars[footer + 1] = ["─"] * view_w
+                colors[footer + 1] = [0] * view_w
+            items: list[str] = []
+            hues: list[int] = []
+            for item in menu[menu_type]:
+                items += list(item) + [" "] * 4
+                hues += [int(Graphics.Color.Cyan)] + [0] * (len(item) + 3)
+            items = items[:view_w]
+            chars[footer + 2][:len(items)] = items
+            colors[footer + 2][:len(items)] = hues[:len(items)]
+            return chars, colors
+
+        def send(data: str) -> None:
             """
-            Render solution path through maze (viewport-aware, continuous).
+            Send one frame's output in a single write.
             """
-            x = self.start.x * 2 + 1
-            y = self.start.y * 2 + 1
-
-            def draw(px: int, py: int) -> None:
-                sx = px - off_x
-                sy = py - off_y
-                if 0 <= sx < view_w and 0 <= sy < view_h:
-                    cursor.move_to(sx, sy)
-                    stdout.write(self.path_symbol)
-
-            Graphics.set(self.path_color)
-
-            for c in self.path:
-                if c == "N":
-                    draw(x, y - 1)
-                    draw(x, y - 2)
-                    y -= 2
-                elif c == "S":
-                    draw(x, y + 1)
-                    draw(x, y + 2)
-                    y += 2
-                elif c == "E":
-                    draw(x + 1, y)
-                    draw(x + 2, y)
-                    x += 2
-                elif c == "W":
-                    draw(x - 1, y)
-                    draw(x - 2, y)
-                    x -= 2
-
-                stdout.flush()
-                if animate:
-                    sleep(0.02)
-            Graphics.reset()
+            stdout.write(data)
+            stdout.flush()
 
         kbd = Visualizer.Keyboard()
         mode = Visualizer.Keyboard.enable_raw_mode()
         refresh = True
         menu_type = "Main"
         menu: Any = Visualizer.menu
+        # Pans scroll or shift the lines already on the terminal instead
+        # of redrawing them
+        screen = Visualizer.Screen()
+        pan = False
+        view = (view_w, view_h)
+        view_x = off_x
+        view_y = off_y
+        # The first display animates the path, two cells per tick
+        tick = 0.02
+        drawn = None if self.path_drawn else 0
+        next_tick = monotonic()
+        # SIGWINCH wakes the event loop through a pipe
+        wake_r, wake_w = pipe()
+        set_blocking(wake_w, False)
+
+        def on_resize(signum: int, frame: FrameType | None) -> None:
+            try:
+                write(wake_w, b"\0")
+            except BlockingIOError:
+                pass
+
+        old_resize = signal(SIGWINCH, on_resize)
         term.enter_alternate()
+        cursor.hide()
 
         try:
             while True:
@@ -484,71 +922,63 @@ class Visualizer:
                     view_h = max(1, term.height - menu_lines)
                     clamp_offsets()
 
-                    term.clear()
-                    cursor.hide()
-                    cursor.home()
-                    _walls()
-                    _logo()
-                    if self.width <= 18 or self.height <= 18:
-                        cursor.move_to(0, term.height - 3)
-                        Graphics.set(Graphics.Color.Yellow)
-                        msg = "⚠️ Info: Maze too small for the 42 pattern"
-                        stdout.write(msg)
-                        Graphics.reset()
-                    cursor.move_to(0, term.height - 2)
-                    stdout.write("─" * term.width)
-                    for item in menu[menu_type]:
-                        Graphics.menu(item)
-                        stdout.write("    ")
-
-                    # Draw E/S if visible
-                    ex = self.end.x * 2 + 1
-                    ey = self.end.y * 2 + 1
-                    sx0 = self.start.x * 2 + 1
-                    sy0 = self.start.y * 2 + 1
-
-                    e_scr_x, e_scr_y = to_screen(ex, ey)
-                    s_scr_x, s_scr_y = to_screen(sx0, sy0)
-
-                    if in_view(s_scr_x, s_scr_y):
-                        cursor.move_to(s_scr_x, s_scr_y)
-                        stdout.write("S")
-
-                    if not self.path_drawn:
-                        _path(animate=True)
-                        self.path_drawn = True
-                    else:
-                        _path()
-
-                    if in_view(e_scr_x, e_scr_y):
-                        cursor.move_to(e_scr_x, e_scr_y)
-                        stdout.write("E")
-
-                    stdout.flush()
+                    data = ""
+                    if pan and (view_w, view_h) == view:
+                        data = screen.scroll(off_y - view_y, view_h)
+                        data += screen.shift(off_x - view_x, view_h)
+                    view = (view_w, view_h)
+                    view_x = off_x
+                    view_y = off_y
+                    pan = False
+
+                    chars, colors = compose(drawn)
+                    send(data + screen.update(chars, colors))
                     refresh = False
 
-                key = kbd.get_key()
+                # Sleep until a key, a resize or the next animation tick
+                timeout = None
+                if drawn is not None:
+                    timeout = max(0.0, next_tick - monotonic())
+                key = kbd.get_key(timeout, wake_r)
+                if key is None and drawn is not None:
+                    color = int(self.path_color)
+                    for x, y in self._trail[drawn:drawn + 2]:
+                        put(chars, colors, x, y, self.path_symbol, color)
+                    drawn += 2
+                    if drawn >= len(self._trail):
+                        drawn = None
+                        self.path_drawn = True
+                        ex = self.end.x * 2 + 1
+                        ey = self.end.y * 2 + 1
+                        put(chars, colors, ex, ey, "E", 0)
+                    send(screen.update(chars, colors))
+                    next_tick += tick
                 if key:
                     match key.lower():
-                        case "q":
+                        case "q" | "eof":
                             return False, None
 
+                        case "wake":
+                            refresh = True
+
                         # Viewport panning with arrow keys
                         case "up":
                             off_y = max(0, off_y - 1)
+                            pan = True
                             refresh = True
                         case "down":
-                            out_h = len(out)
                             max_off_y = max(0, out_h - view_h)
                             off_y = min(max_off_y, off_y + 1)
+                            pan = True
                             refresh = True
                         case "left":
                             off_x = max(0, off_x - 2)
+                            pan = True
                             refresh = True
                         case "right":
-                            out_w = len(out[0]) if out else 0
                             max_off_x = max(0, out_w - view_w)
                             off_x = min(max_off_x, off_x + 2)
+                            pan = True
                             refresh = True
 
                         case "n" if menu_type == "Main":
@@ -685,6 +1115,9 @@ class Visualizer:
                             refresh = True
 
         finally:
+            signal(SIGWINCH, old_resize)
+            close(wake_r)
+            close(wake_w)
             Visualizer.Keyboard.disable_raw_mode(mode)
             cursor.show()
             term.exit_alternate()
@@ -0,0 +1,100 @@
+"""
+Maze generator using Wilson's algorithm.
+
+Starting from a maze of the entry cell only, a loop-erased random walk is
+run from every cell outside the maze until it hits the maze, and the walk
+is carved. Only the last direction taken from each cell is remembered, so
+loops are erased for free. The result is a uniform spanning tree: every
+possible maze is equally likely.
+"""
+
+from __future__ import annotations
+from random import Random
+from typing import TYPE_CHECKING
+from .mask_42 import checked_p42_mask
+from .imperfect import make_imperfect
+from .grid import BATCH, Observer, flatten, notify, padded_mask, store
+
+if TYPE_CHECKING:
+    from .mazegen import MazeGenerator
+
+# Padded bitmap values
+OUTSIDE = 0
+INSIDE = 1
+CLOSED = 2
+
+
+def wilson(
+    maze: MazeGenerator,
+    rng: Random | None = None,
+    observer: Observer | None = None,
+    batch: int = BATCH,
+) -> None:
+    """
+    Wilson algorithm used by the MazeGenerator class
+
+    :param maze: MazeGenerator class
+    :param rng: Random number generator, seeded from maze.seed if None
+    :param observer: Called with the carve events of every batch carves
+    :param batch: Number of carves per observer call
+    """
+    assert maze.entry is not None
+    assert maze.height is not None
+    assert maze.width is not None
+    assert maze.grid is not None
+
+    blocked = checked_p42_mask(maze)
+    if rng is None:
+        rng = Random(maze.seed)
+    random = rng.random
+    width = maze.width
+    height = maze.height
+    cells = flatten(maze.grid)
+
+    stride = width + 2
+    state = padded_mask(width, height, blocked, CLOSED)
+    heading = bytearray(len(state))
+    ex, ey = maze.entry
+    state[(ex + 1) * stride + ey + 1] = INSIDE
+    step = [-stride, 1, stride, -1]
+    cell_step = [-width, 1, width, -1]
+    wall = [~1, ~2, ~4, ~8]
+    opposite_wall = [~4, ~8, ~1, ~2]
+    carved: list[int] = []
+    log = None if observer is None else carved.append
+    countdown = batch
+    start = state.find(OUTSIDE)
+    while start >= 0:
+        # Random walk until the maze is hit, overwriting the heading of
+        # revisited cells
+        i = start
+        while state[i] == OUTSIDE:
+            d = int(random() * 4)
+            while state[i + step[d]] == CLOSED:
+                d = int(random() * 4)
+            heading[i] = d
+            i += step[d]
+
+        # Carve the loop-erased walk
+        i = start
+        while state[i] == OUTSIDE:
+            state[i] = INSIDE
+            d = heading[i]
+            c = i - stride + 1 - 2 * (i // stride)
+            cells[c] &= wall[d]
+            cells[c + cell_step[d]] &= opposite_wall[d]
+            if log is not None:
+                log(c << 2 | d)
+                countdown -= 1
+                if not countdown:
+                    notify(observer, carved)
+                    countdown = batch
+            i += step[d]
+        start = state.find(OUTSIDE, start)
+    store(maze.grid, cells, width)
+    notify(observer, carved)
+
+    if not maze.perfect:
+        make_imperfect(
+            maze, blocked, rng=rng, observer=observer, batch=batch
+        )
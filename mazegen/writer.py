@@ -0,0 +1,49 @@
+"""
+Maze output file writer.
+
+Rows are encoded to hexadecimal digits with a 16 entry translation table
+(one ``bytes.translate`` per row instead of one ``hex()`` call per cell) and
+written through a large binary buffer. Rows can come from any iterable, so a
+generator that yields rows as they are finished streams straight to disk.
+"""
+
+from __future__ import annotations
+from os import PathLike
+from typing import Iterable, Union
+
+HEX_DIGITS = bytes.maketrans(bytes(range(16)), b"0123456789ABCDEF")
+CHUNK_SIZE = 1 << 20
+
+
+def write_maze(
+    file: Union[str, PathLike[str]],
+    rows: Iterable[Union[bytes, bytearray, memoryview, Iterable[int]]],
+    entry: tuple[int, int] | None,
+    exit: tuple[int, int] | None,
+    path: str | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> None:
+    """
+    Write a maze in the text output format
+
+    :param file: Output file
+    :param rows: Rows of wall values (0-15), first row first
+    :param entry: Entry coordinates, written if set
+    :param exit: Exit coordinates, written if set
+    :param path: Solution path (N/E/S/W), written if set
+    :param chunk_size: Size of the write buffer in bytes
+    """
+    with open(file, "wb", buffering=chunk_size) as fp:
+        write = fp.write
+        for row in rows:
+            write(bytes(row).translate(HEX_DIGITS))
+            write(b"\n")
+
+        write(b"\n")
+
+        if entry:
+            write(f"{entry[0]}, {entry[1]}\n".encode())
+        if exit:
+            write(f"{exit[0]}, {exit[1]}\n".encode())
+        if path is not None:
+            write(path.encode() + b"\n")
@@ -3,146 +3,805 @@ Universal pathfinder that works by reading maze output file.
 Works with any maze generator that follows the output format.
 """
 
+from __future__ import annotations
 from os import PathLike
-from typing import Union
-from collections import deque
+from typing import TYPE_CHECKING, Callable, Iterable, Union
+from array import array
+from heapq import heappop, heappush
+from mazegen.grid import flatten
+from mazegen.loader import Cells, MappedGrid, load_maze
+
+if TYPE_CHECKING:
+    from mazegen import MazeGenerator
+
+
+_DIRECTIONS = bytes.maketrans(b"\x01\x02\x03\x04", b"NESW")
+_OPPOSITE = str.maketrans("NESW", "SWNE")
+# Per cell value: open east/south walls (each passage counted once) and
+# whether the cell has any open wall at all
+_LINKS = bytes((not v & 2) + (not v & 4) for v in range(256))
+_OPEN = bytes(v != 15 for v in range(256))
+
+
+def _chunks(cells: Cells) -> Iterable[bytes | bytearray]:
+    """Cells as byte strings: whole when loaded, row by row when mapped."""
+    if isinstance(cells, MappedGrid):
+        return cells.rows()
+    return (cells,)
 
 
 class PathFinder:
     """Find shortest path in maze by reading output file."""
 
-    def __init__(self, output_file: Union[str, PathLike[str]]) -> None:
+    def __init__(
+        self,
+        output_file: Union[str, PathLike[str], None] = None,
+        mapped: bool = False,
+    ) -> None:
         """Initialize pathfinder with output file.
 
         Args:
-            output_file: Path to maze output file.
+            output_file: Path to maze output file. If None, nothing is
+                loaded; use from_maze() to solve an in-memory maze.
+            mapped: Map the file with MappedGrid instead of loading it,
+                so walls are read from disk on demand. Slower per cell,
+                but only the search state (one byte per cell) is kept
+                in memory.
         """
         self.output_file = output_file
-        self.grid: list[list[int]] = []
+        self.mapped = mapped
+        self.cells: Cells = bytearray()
         self.width = 0
         self.height = 0
         self.entry: tuple[int, int] | None = None
         self.exit: tuple[int, int] | None = None
-        self._load_maze()
+        self.expanded = 0
+        self.perfect: bool | None = None
+        if output_file is not None:
+            self._load_maze()
+
+    @classmethod
+    def from_maze(cls, maze: MazeGenerator) -> PathFinder:
+        """Create a pathfinder for a generated maze without reading a file.
+
+        Args:
+            maze: Generated maze; its grid is used as is, not copied.
+
+        Returns:
+            PathFinder ready for find_path().
+        """
+        assert maze.grid is not None
+        assert maze.width is not None
+        assert maze.height is not None
+        finder = cls()
+        finder.output_file = maze.output
+        finder.cells = flatten(maze.grid)
+        finder.width = maze.width
+        finder.height = maze.height
+        finder.entry = maze.entry
+        finder.exit = maze.exit
+        finder.perfect = maze.perfect
+        return finder
+
+    @property
+    def grid(self) -> list[list[int]]:
+        """Maze walls as rows of cells, built from the flat cell array."""
+        w = self.width
+        cells = self.cells
+        return [list(cells[i:i + w]) for i in range(0, len(cells), w)]
 
     def _load_maze(self) -> None:
         """Load maze, entry, and exit from output file."""
-        with open(self.output_file, "r") as f:
-            lines = f.readlines()
-
-        idx = 0
-        while idx < len(lines):
-            line = lines[idx].strip()
-            if not line:
-                idx += 1
-                break
-            row = [int(c, 16) for c in line]
-            self.grid.append(row)
-            idx += 1
-
-        self.height = len(self.grid)
-        self.width = len(self.grid[0]) if self.grid else 0
-
-        if idx < len(lines):
-            entry_line = lines[idx].strip()
-            entry_parts = entry_line.split(',')
-            self.entry = (int(entry_parts[0].strip()),
-                          int(entry_parts[1].strip()))
-            idx += 1
-
-        if idx < len(lines):
-            exit_line = lines[idx].strip()
-            exit_parts = exit_line.split(',')
-            self.exit = (int(exit_parts[0].strip()),
-                         int(exit_parts[1].strip()))
-
-    def find_path(self) -> str | None:
-        """Find shortest path using BFS.
+        assert self.output_file is not None
+        if self.mapped:
+            grid = MappedGrid(self.output_file)
+            self.cells = grid
+            self.width = grid.width
+            self.height = grid.height
+            self.entry = grid.entry
+            self.exit = grid.exit
+            self.perfect = grid.perfect
+            return
+        data = load_maze(self.output_file)
+        self.cells = data["cells"]
+        self.width = data["width"]
+        self.height = data["height"]
+        self.entry = data["entry"]
+        self.exit = data["exit"]
+        self.perfect = data["perfect"]
+
+    def find_path(self, strategy: str = "auto") -> str | None:
+        """Find shortest path from entry to exit.
+
+        Strategies:
+            auto: tree when the maze is perfect, bfs otherwise.
+            tree: single walk, see _tree(); bfs when the maze is not
+                perfect.
+            bfs: breadth-first search from the entry.
+            astar: A* with the Manhattan distance to the exit.
+            bidirectional: breadth-first search from both ends at once.
+
+        All strategies return a path of the same, shortest length; the
+        directions may differ between strategies when several shortest
+        paths exist. The number of cells expanded is stored in
+        ``self.expanded``.
+
+        Args:
+            strategy: One of "auto", "tree", "bfs", "astar" or
+                "bidirectional".
 
         Returns:
             Path as string of directions(N, E, S, W) or None if no path exists.
         """
-        start = self.entry
-        end = self.exit
-
-        if start is None or end is None:
+        self.expanded = 0
+        if self.entry is None or self.exit is None:
             return None
 
-        queue = deque([start])
-        visited = {start}
-        parent: dict[tuple[int, int], tuple[int, int] | None] = {start: None}
-        direction_taken: dict[tuple[int, int], str | None] = {start: None}
+        w = self.width
+        start = self.entry[1] * w + self.entry[0]
+        end = self.exit[1] * w + self.exit[0]
+        if start == end:
+            return ""
+
+        if strategy in ("auto", "tree"):
+            strategy = "tree" if self.is_perfect() else "bfs"
 
-        while queue:
-            current = queue.popleft()
+        match strategy:
+            case "tree":
+                return self._tree(start, end)
+            case "bfs":
+                return self._bfs(start, end)
+            case "astar":
+                return self._astar(start, end)
+            case "bidirectional":
+                return self._bidirectional(start, end)
+            case _:
+                raise ValueError(f"Unknown strategy: {strategy}")
 
-            if current == end:
-                return self._build_path(start, end, parent, direction_taken)
+    def is_perfect(self) -> bool:
+        """Tell whether the maze is a tree (exactly one path between cells).
+
+        Uses ``self.perfect`` when it is known (e.g. from_maze() or a
+        .mzb header). Otherwise the component of the entry is walked and
+        its passages counted: a connected component is a tree when it has
+        one passage less than it has cells. Counting over the whole grid
+        is not enough, as a loop in one component can make up for a
+        second, separate component.
+
+        Returns:
+            True if the maze is (detected as) perfect.
+        """
+        if self.perfect is not None:
+            return self.perfect
+        root = self._root()
+        if root < 0:
+            return False
+        opened, links = self._component(root)
+        return links == opened - 1
 
-            for neighbor, dir_char in self._get_neighbors(current):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    parent[neighbor] = current
-                    direction_taken[neighbor] = dir_char
-                    queue.append(neighbor)
+    def _root(self) -> int:
+        """Linear index of the entry, or of the first open cell.
+
+        Returns:
+            Cell index, or -1 if the maze has no open cell.
+        """
+        if self.entry is not None:
+            return self.entry[1] * self.width + self.entry[0]
+        root = 0
+        for chunk in _chunks(self.cells):
+            found = chunk.translate(_OPEN).find(1)
+            if found >= 0:
+                return root + found
+            root += len(chunk)
+        return -1
+
+    def _component(self, start: int) -> tuple[int, int]:
+        """Count the cells and passages reachable from start.
+
+        Args:
+            start: Linear index of the first cell.
+
+        Returns:
+            Number of cells and number of passages (each counted once)
+            of the component.
+        """
+        w = self.width
+        cells = self.cells
+        size = len(cells)
+        last = w - 1
+
+        seen = bytearray(size)
+        seen[start] = 1
+        stack = [start]
+        pop = stack.pop
+        push = stack.append
+        opened = 0
+        links = 0
+        while stack:
+            i = pop()
+            opened += 1
+            walls = cells[i]
+            links += _LINKS[walls]
+            if not walls & 1 and i >= w and not seen[i - w]:
+                seen[i - w] = 1
+                push(i - w)
+            if not walls & 2 and i % w != last and not seen[i + 1]:
+                seen[i + 1] = 1
+                push(i + 1)
+            if not walls & 4 and i + w < size and not seen[i + w]:
+                seen[i + w] = 1
+                push(i + w)
+            if not walls & 8 and i % w and not seen[i - 1]:
+                seen[i - 1] = 1
+                push(i - 1)
+        return opened, links
+
+    def _tree(self, start: int, end: int) -> str | None:
+        """Walk a perfect maze from entry until the exit is found.
+
+        In a tree the path to any cell is unique, so a depth-first walk
+        that never steps back to its parent finds it without BFS queues.
+        The only state is one byte per cell holding the direction taken
+        into it, from which the parent follows. Reaching a cell a second
+        time means the maze has a loop, in which case this falls back to
+        breadth-first search.
+
+        Args:
+            start: Linear index of the entry cell.
+            end: Linear index of the exit cell.
+
+        Returns:
+            Path as string of directions or None if no path exists.
+        """
+        w = self.width
+        cells = self.cells
+        size = len(cells)
+        last = w - 1
+
+        # came[i]: 0 unvisited, 1..4 reached going N/E/S/W, 5 start
+        came = bytearray(size)
+        came[start] = 5
+        stack = [start]
+        pop = stack.pop
+        push = stack.append
+        while stack:
+            i = pop()
+            if i == end:
+                return self._build_path(came, end)
+            self.expanded += 1
+            walls = cells[i]
+            back = came[i]
+            if not walls & 1 and back != 3 and i >= w:
+                j = i - w
+                if came[j]:
+                    return self._bfs(start, end)
+                came[j] = 1
+                push(j)
+            if not walls & 2 and back != 4 and i % w != last:
+                j = i + 1
+                if came[j]:
+                    return self._bfs(start, end)
+                came[j] = 2
+                push(j)
+            if not walls & 4 and back != 1 and i + w < size:
+                j = i + w
+                if came[j]:
+                    return self._bfs(start, end)
+                came[j] = 3
+                push(j)
+            if not walls & 8 and back != 2 and i % w:
+                j = i - 1
+                if came[j]:
+                    return self._bfs(start, end)
+                came[j] = 4
+                push(j)
 
         return None
 
-    def _get_neighbors(
-            self, pos: tuple[int, int]) -> list[tuple[tuple[int, int], str]]:
-        """Get accessible neighboring cells."""
-        x, y = pos
-        neighbors = []
-        walls = self.grid[y][x]
-
-        if y > 0 and not (walls & (1 << 0)):
-            neighbors.append(((x, y - 1), 'N'))
-        if x < self.width - 1 and not (walls & (1 << 1)):
-            neighbors.append(((x + 1, y), 'E'))
-        if y < self.height - 1 and not (walls & (1 << 2)):
-            neighbors.append(((x, y + 1), 'S'))
-        if x > 0 and not (walls & (1 << 3)):
-            neighbors.append(((x - 1, y), 'W'))
-
-        return neighbors
-
-    def _build_path(
-        self, start: tuple[int, int],
-        end: tuple[int, int],
-        parent: dict[tuple[int, int], tuple[int, int] | None],
-        direction_taken: dict[tuple[int, int], str | None]
-    ) -> str:
-        """Reconstruct path from start to end.
+    def _bfs(self, start: int, end: int) -> str | None:
+        """Breadth-first search over linear cell indices.
+
+        A single byte per cell records the direction used to reach it,
+        which doubles as the visited flag; the parent of a cell is its
+        index minus that direction's step.
 
         Args:
-            start: Starting position.
-            end: Ending position.
-            parent: Parent map from BFS.
-            direction_taken: Direction map from BFS.
+            start: Linear index of the entry cell.
+            end: Linear index of the exit cell.
 
         Returns:
-            Path as string of directions.
+            Path as string of directions or None if no path exists.
         """
-        path = []
-        current = end
+        w = self.width
+        cells = self.cells
+        size = len(cells)
 
-        while current != start:
-            direction = direction_taken[current]
-            if direction:
-                path.append(direction)
+        # came[i]: 0 unvisited, 1..4 reached going N/E/S/W, 5 start
+        came = bytearray(size)
+        came[start] = 5
+        last = w - 1
+        frontier = [start]
+        while frontier:
+            self.expanded += len(frontier)
+            nxt: list[int] = []
+            push = nxt.append
+            for i in frontier:
+                walls = cells[i]
+                if not walls & 1 and i >= w:
+                    j = i - w
+                    if not came[j]:
+                        came[j] = 1
+                        push(j)
+                if not walls & 2 and i % w != last:
+                    j = i + 1
+                    if not came[j]:
+                        came[j] = 2
+                        push(j)
+                if not walls & 4 and i + w < size:
+                    j = i + w
+                    if not came[j]:
+                        came[j] = 3
+                        push(j)
+                if not walls & 8 and i % w:
+                    j = i - 1
+                    if not came[j]:
+                        came[j] = 4
+                        push(j)
+            if came[end]:
+                return self._build_path(came, end)
+            frontier = nxt
 
-            next_cell = parent[current]
-            if next_cell is None:
-                break
-            current = next_cell
+        return None
+
+    def _astar(
+        self,
+        start: int,
+        end: int,
+        estimate: Callable[[int], int] | None = None,
+    ) -> str | None:
+        """A* search, by default with the Manhattan distance heuristic.
+
+        Ties on f = g + h are broken towards the smaller h, which keeps
+        the search close to the straight line towards the exit.
+
+        Args:
+            start: Linear index of the entry cell.
+            end: Linear index of the exit cell.
+            estimate: Admissible lower bound of the distance from a cell
+                index to the exit, used instead of the Manhattan distance.
+
+        Returns:
+            Path as string of directions or None if no path exists.
+        """
+        w = self.width
+        h = self.height
+        cells = self.cells
+        ey, ex = divmod(end, w)
+
+        came = bytearray(w * h)
+        came[start] = 5
+        closed = bytearray(w * h)
+        cost = array("i", [-1]) * (w * h)
+        cost[start] = 0
+        sy, sx = divmod(start, w)
+        if estimate is None:
+            dist = abs(sx - ex) + abs(sy - ey)
+        else:
+            dist = estimate(start)
+        heap = [(dist, dist, start)]
+        # (dx, dy, wall bit, came code)
+        moves = ((0, -1, 1, 1), (1, 0, 2, 2), (0, 1, 4, 3), (-1, 0, 8, 4))
+        while heap:
+            _, _, i = heappop(heap)
+            if closed[i]:
+                continue
+            if i == end:
+                return self._build_path(came, end)
+            closed[i] = 1
+            self.expanded += 1
+            y, x = divmod(i, w)
+            walls = cells[i]
+            g = cost[i] + 1
+            for dx, dy, bit, code in moves:
+                if walls & bit:
+                    continue
+                nx = x + dx
+                ny = y + dy
+                if not (0 <= nx < w and 0 <= ny < h):
+                    continue
+                j = ny * w + nx
+                if closed[j] or 0 <= cost[j] <= g:
+                    continue
+                cost[j] = g
+                came[j] = code
+                if estimate is None:
+                    dist = abs(nx - ex) + abs(ny - ey)
+                else:
+                    dist = estimate(j)
+                heappush(heap, (g + dist, dist, j))
+
+        return None
+
+    def _bidirectional(self, start: int, end: int) -> str | None:
+        """Breadth-first search growing from both entry and exit.
+
+        The smaller frontier is expanded one full level at a time. The
+        first cell reached by both searches lies on a shortest path.
+
+        Args:
+            start: Linear index of the entry cell.
+            end: Linear index of the exit cell.
 
+        Returns:
+            Path as string of directions or None if no path exists.
+        """
+        w = self.width
+        cells = self.cells
+        size = len(cells)
+        last = w - 1
+
+        came_start = bytearray(size)
+        came_start[start] = 5
+        came_end = bytearray(size)
+        came_end[end] = 5
+
+        def expand(
+            frontier: list[int], came: bytearray, other: bytearray
+        ) -> tuple[list[int], int]:
+            """Expand one level; return next frontier and meeting cell."""
+            nxt: list[int] = []
+            push = nxt.append
+            for i in frontier:
+                walls = cells[i]
+                if not walls & 1 and i >= w:
+                    j = i - w
+                    if not came[j]:
+                        came[j] = 1
+                        if other[j]:
+                            return nxt, j
+                        push(j)
+                if not walls & 2 and i % w != last:
+                    j = i + 1
+                    if not came[j]:
+                        came[j] = 2
+                        if other[j]:
+                            return nxt, j
+                        push(j)
+                if not walls & 4 and i + w < size:
+                    j = i + w
+                    if not came[j]:
+                        came[j] = 3
+                        if other[j]:
+                            return nxt, j
+                        push(j)
+                if not walls & 8 and i % w:
+                    j = i - 1
+                    if not came[j]:
+                        came[j] = 4
+                        if other[j]:
+                            return nxt, j
+                        push(j)
+            return nxt, -1
+
+        front_start = [start]
+        front_end = [end]
+        while front_start and front_end:
+            if len(front_start) <= len(front_end):
+                self.expanded += len(front_start)
+                front_start, meet = expand(front_start, came_start, came_end)
+            else:
+                self.expanded += len(front_end)
+                front_end, meet = expand(front_end, came_end, came_start)
+            if meet >= 0:
+                head = self._build_path(came_start, meet)
+                tail = self._build_path(came_end, meet)
+                return head + tail[::-1].translate(_OPPOSITE)
+
+        return None
+
+    def _build_path(self, came: bytearray, end: int) -> str:
+        """Reconstruct path by walking the direction array back from end.
+
+        Args:
+            came: Direction taken into each cell (1..4 = N/E/S/W, 5 start).
+            end: Linear index of the exit cell.
+
+        Returns:
+            Path as string of directions.
+        """
+        w = self.width
+        back = (0, w, -1, -w, 1)
+        path = []
+        i = end
+        d = came[i]
+        while d != 5:
+            path.append(d)
+            i += back[d]
+            d = came[i]
         path.reverse()
-        return ''.join(path)
+        return bytes(path).translate(_DIRECTIONS).decode()
 
     def save_path(self) -> None:
         """Find path and append to output file."""
         path = self.find_path()
 
-        if path is not None:
+        if path is not None and self.output_file is not None:
             with open(self.output_file, "a") as f:
                 f.write(path + "\n")
+
+
+class DistanceIndex:
+    """Answer many shortest path queries on one fixed maze.
+
+    Built once per maze. For a perfect maze the index roots the spanning
+    tree and keeps binary lifting tables, so the distance between any two
+    cells is found through their lowest common ancestor in O(log n) and
+    the path is read off the tree. For other mazes it stores BFS distance
+    fields from a few landmark cells: distances from a landmark are
+    exact lookups, and any other query runs A* guided by the landmark
+    (ALT) lower bound, which expands far fewer cells than BFS.
+    """
+
+    def __init__(
+        self,
+        finder: PathFinder,
+        landmarks: list[tuple[int, int]] | None = None,
+    ) -> None:
+        """Build the index.
+
+        Args:
+            finder: Loaded pathfinder providing the maze.
+            landmarks: Landmark cells (x, y) for imperfect mazes
+                (default: entry, exit and the four corners).
+        """
+        self.finder = finder
+        self.width = finder.width
+        self.height = finder.height
+        self.tree = finder.is_perfect()
+        self.landmarks: list[int] = []
+        self.fields: list[array[int]] = []
+        self._depth = array("i")
+        self._came = bytearray()
+        self._up: list[array[int]] = []
+        if self.tree:
+            self._build_tree()
+        if not self.tree:
+            self._build_landmarks(landmarks)
+
+    def _index(self, cell: tuple[int, int]) -> int:
+        """Linear index of an (x, y) cell."""
+        x, y = cell
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise ValueError(f"Cell {cell} is outside the maze")
+        return y * self.width + x
+
+    def _sweep(self, source: int) -> tuple[array[int], bytearray]:
+        """Breadth-first search over the whole component of source.
+
+        Args:
+            source: Linear index of the start cell.
+
+        Returns:
+            Distance of every cell (-1 if unreachable) and the direction
+            taken into it (1..4 = N/E/S/W, 5 source, 0 unreachable).
+        """
+        w = self.width
+        cells = self.finder.cells
+        size = len(cells)
+        last = w - 1
+        dist = array("i", [-1]) * size
+        came = bytearray(size)
+        dist[source] = 0
+        came[source] = 5
+        frontier = [source]
+        level = 0
+        while frontier:
+            level += 1
+            nxt: list[int] = []
+            push = nxt.append
+            for i in frontier:
+                walls = cells[i]
+                if not walls & 1 and i >= w:
+                    j = i - w
+                    if not came[j]:
+                        came[j] = 1
+                        dist[j] = level
+                        push(j)
+                if not walls & 2 and i % w != last:
+                    j = i + 1
+                    if not came[j]:
+                        came[j] = 2
+                        dist[j] = level
+                        push(j)
+                if not walls & 4 and i + w < size:
+                    j = i + w
+                    if not came[j]:
+                        came[j] = 3
+                        dist[j] = level
+                        push(j)
+                if not walls & 8 and i % w:
+                    j = i - 1
+                    if not came[j]:
+                        came[j] = 4
+                        dist[j] = level
+                        push(j)
+            frontier = nxt
+        return dist, came
+
+    def _build_tree(self) -> None:
+        """Root the spanning tree and build the binary lifting tables.
+
+        Clears ``self.tree`` when the tree does not span every open cell,
+        as cells outside it would have no depth; landmarks are used then.
+        """
+        finder = self.finder
+        root = max(finder._root(), 0)
+        self._depth, self._came = self._sweep(root)
+        reached = len(self._came) - self._came.count(0)
+        opened = sum(
+            sum(chunk.translate(_OPEN)) for chunk in _chunks(finder.cells)
+        )
+        if reached < opened:
+            self.tree = False
+            self._depth = array("i")
+            self._came = bytearray()
+            return
+
+        w = self.width
+        back = (0, w, -1, -w, 1)
+        came = self._came
+        parent = [
+            i + back[d] if d and d != 5 else i for i, d in enumerate(came)
+        ]
+        levels = max(self._depth).bit_length()
+        up = [parent]
+        for _ in range(1, levels):
+            prev = up[-1]
+            up.append([prev[p] for p in prev])
+        self._up = [array("i", table) for table in up]
+
+    def _build_landmarks(
+        self, landmarks: list[tuple[int, int]] | None
+    ) -> None:
+        """Compute a BFS distance field from every landmark."""
+        finder = self.finder
+        if landmarks is None:
+            w, h = self.width, self.height
+            landmarks = [(0, 0), (w - 1, 0), (0, h - 1), (w - 1, h - 1)]
+            if finder.exit is not None:
+                landmarks.insert(0, finder.exit)
+            if finder.entry is not None:
+                landmarks.insert(0, finder.entry)
+        for cell in dict.fromkeys(landmarks):
+            index = self._index(cell)
+            self.landmarks.append(index)
+            self.fields.append(self._sweep(index)[0])
+
+    def _lca(self, a: int, b: int) -> int:
+        """Lowest common ancestor of two cells of the rooted tree."""
+        depth = self._depth
+        up = self._up
+        if depth[a] < depth[b]:
+            a, b = b, a
+        diff = depth[a] - depth[b]
+        k = 0
+        while diff:
+            if diff & 1:
+                a = up[k][a]
+            diff >>= 1
+            k += 1
+        if a == b:
+            return a
+        for table in reversed(up):
+            if table[a] != table[b]:
+                a = table[a]
+                b = table[b]
+        return up[0][a]
+
+    def bounds(
+        self, a: tuple[int, int], b: tuple[int, int]
+    ) -> tuple[int, int]:
+        """Lower and upper bound of the distance from the landmarks.
+
+        Args:
+            a: Start cell (x, y).
+            b: Goal cell (x, y).
+
+        Returns:
+            (lower, upper) bounds; (0, -1) if no landmark reaches both.
+        """
+        i = self._index(a)
+        j = self._index(b)
+        lower = 0
+        upper = -1
+        for field in self.fields:
+            da = field[i]
+            db = field[j]
+            if da < 0 or db < 0:
+                continue
+            lower = max(lower, abs(da - db))
+            upper = da + db if upper < 0 else min(upper, da + db)
+        return lower, upper
+
+    def distance(self, a: tuple[int, int], b: tuple[int, int]) -> int | None:
+        """Length of the shortest path between two cells.
+
+        Args:
+            a: Start cell (x, y).
+            b: Goal cell (x, y).
+
+        Returns:
+            Number of steps, or None if b is unreachable from a. A cell
+            is at distance 0 from itself unless it is fully walled.
+        """
+        i = self._index(a)
+        j = self._index(b)
+        if i == j:
+            return 0 if _OPEN[self.finder.cells[i]] else None
+        if self.tree:
+            depth = self._depth
+            if depth[i] < 0 or depth[j] < 0:
+                return None
+            return depth[i] + depth[j] - 2 * depth[self._lca(i, j)]
+        for index, field in zip(self.landmarks, self.fields):
+            if index == i:
+                return field[j] if field[j] >= 0 else None
+            if index == j:
+                return field[i] if field[i] >= 0 else None
+        path = self.path(a, b)
+        return None if path is None else len(path)
+
+    def path(self, a: tuple[int, int], b: tuple[int, int]) -> str | None:
+        """Shortest path between two cells.
+
+        Args:
+            a: Start cell (x, y).
+            b: Goal cell (x, y).
+
+        Returns:
+            Path as string of directions(N, E, S, W) or None if no path;
+            empty from a cell to itself unless it is fully walled.
+        """
+        i = self._index(a)
+        j = self._index(b)
+        if i == j:
+            return "" if _OPEN[self.finder.cells[i]] else None
+        if not self.tree:
+            return self.finder._astar(i, j, self._estimate(j))
+
+        if self._depth[i] < 0 or self._depth[j] < 0:
+            return None
+        lca = self._lca(i, j)
+        came = self._came
+        back = self._up[0]
+        up: list[int] = []
+        while i != lca:
+            up.append(came[i])
+            i = back[i]
+        down: list[int] = []
+        while j != lca:
+            down.append(came[j])
+            j = back[j]
+        down.reverse()
+        head = bytes(up).translate(_DIRECTIONS).decode()
+        return head.translate(_OPPOSITE) + (
+            bytes(down).translate(_DIRECTIONS).decode()
+        )
+
+    def _estimate(self, goal: int) -> Callable[[int], int]:
+        """ALT heuristic: landmark lower bound of the distance to goal."""
+        pairs = [
+            (field, field[goal]) for field in self.fields if field[goal] >= 0
+        ]
+
+        def estimate(i: int) -> int:
+            best = 0
+            for field, dg in pairs:
+                di = field[i]
+                if di >= 0:
+                    d = di - dg if di > dg else dg - di
+                    if d > best:
+                        best = d
+            return best
+
+        return estimate
@@ -0,0 +1,139 @@
+import pytest
+
+from mazegen import MazeGenerator, hak
+from mazegen.grid import flatten
+from mazegen.mask_42 import p42_cells
+from mazegen.mazegen import ALGORITHMS
+
+# Grids of a 12x10 maze, entry (3, 2), seed 42, as generated before any
+# of the performance work; one hex digit per cell as in the output file
+PINNED = {
+    "dfs": [
+        "B95155155553", "86BC53E9553E", "C1453C1457C3", "D6BFAFAFFF92",
+        "956FEF857FAA", "A93FFFAFFFAA", "C6AD3FAFD52E", "D3C3AFEFFFC3",
+        "947C293D513A", "C55546C556C6",
+    ],
+    "hak": [
+        "951155515393", "83AAD3BA96AA", "AAEC3C06C7AA", "AC7FAFAFFFAA",
+        "853FEF857FEA", "A96FFFAFFF96", "AC553FAFD543", "C793AFEFFF96",
+        "956C691553C3", "C55556C57C56",
+    ],
+}
+
+
+def make_maze(
+    algorithm: str,
+    width: int = 12,
+    height: int = 10,
+    entry: tuple[int, int] = (3, 2),
+    seed: int = 42,
+    perfect: bool = True,
+) -> MazeGenerator:
+    maze = MazeGenerator()
+    maze.width = width
+    maze.height = height
+    maze.entry = entry
+    maze.exit = (width - 1, height - 1)
+    maze.perfect = perfect
+    maze.seed = seed
+    maze.algorithm = algorithm
+    maze.reset()
+    return maze
+
+
+def hex_rows(maze: MazeGenerator) -> list[str]:
+    assert maze.grid is not None and maze.width is not None
+    cells = flatten(maze.grid)
+    w = maze.width
+    return [
+        "".join(f"{v:X}" for v in cells[i:i + w])
+        for i in range(0, len(cells), w)
+    ]
+
+
+def assert_spanning_tree(maze: MazeGenerator, tree: bool = True) -> None:
+    """Walls agree between neighbors, the border is closed, exactly the
+    42 mask is sealed and the open cells form a single tree (or, with
+    tree False, a single component) containing the entry."""
+    assert maze.grid is not None
+    assert maze.width is not None and maze.height is not None
+    assert maze.entry is not None
+    w, h = maze.width, maze.height
+    cells = flatten(maze.grid)
+    links = 0
+    for i, v in enumerate(cells):
+        y, x = divmod(i, w)
+        if y == 0:
+            assert v & 1
+        if y == h - 1:
+            assert v & 4
+        if x == 0:
+            assert v & 8
+        if x == w - 1:
+            assert v & 2
+        if x < w - 1:
+            assert bool(v & 2) == bool(cells[i + 1] & 8)
+            links += not v & 2
+        if y < h - 1:
+            assert bool(v & 4) == bool(cells[i + w] & 1)
+            links += not v & 4
+    opened = [i for i, v in enumerate(cells) if v != 15]
+    sealed = {y * w + x for y, x in p42_cells(w, h)}
+    assert set(range(w * h)) - set(opened) == sealed
+    if tree:
+        assert links == len(opened) - 1
+    else:
+        assert links >= len(opened) - 1
+
+    # Generators index the entry as grid[entry[0]][entry[1]]
+    start = maze.entry[0] * w + maze.entry[1]
+    assert cells[start] != 15
+    seen = {start}
+    stack = [start]
+    while stack:
+        i = stack.pop()
+        v = cells[i]
+        for bit, j in ((1, i - w), (2, i + 1), (4, i + w), (8, i - 1)):
+            if not v & bit and j not in seen:
+                seen.add(j)
+                stack.append(j)
+    assert seen == set(opened)
+
+
+def test_pinned_grids() -> None:
+    for algorithm, rows in PINNED.items():
+        maze = make_maze(algorithm)
+        maze.generate()
+        assert hex_rows(maze) == rows, algorithm
+        assert_spanning_tree(maze)
+
+
+def test_hak_hunt_modes_agree() -> None:
+    for entry in ((0, 0), (3, 2), (9, 11), (5, 0)):
+        for seed in range(5):
+            grids = []
+            for incremental in (True, False):
+                maze = make_maze("hak", entry=entry, seed=seed)
+                hak(maze, incremental=incremental)
+                assert_spanning_tree(maze)
+                grids.append(hex_rows(maze))
+            assert grids[0] == grids[1], (entry, seed)
+
+
+@pytest.mark.parametrize("algorithm", list(ALGORITHMS))
+def test_engines_span_every_size(algorithm: str) -> None:
+    for width in range(1, 15):
+        for height in range(1, 15):
+            if width * height < 2:
+                continue
+            # The origin and the far corner of the diagonal, both outside
+            # the 42 mask at every size
+            k = min(width, height) - 1
+            for entry in dict.fromkeys([(0, 0), (k, k)]):
+                for seed in range(2):
+                    maze = make_maze(
+                        algorithm, width, height, entry, seed, seed == 0
+                    )
+                    maze.exit = (0, 0) if entry != (0, 0) else (k, k)
+                    maze.generate()
+                    assert_spanning_tree(maze, tree=bool(maze.perfect))
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+import pytest
+
+from mazegen import MazeGenerator
+
+
+def stream_maze(tmp_path: Path) -> MazeGenerator:
+    """Maze configured with STREAM=True, which never builds a grid."""
+    config = tmp_path / "config.txt"
+    config.write_text(
+        "WIDTH=20\nHEIGHT=15\nENTRY=0,0\nEXIT=19,14\n"
+        f"OUTPUT_FILE={tmp_path / 'maze.txt'}\nPERFECT=True\n"
+        "SEED=42\nSTREAM=True\n"
+    )
+    maze = MazeGenerator()
+    maze.read(config)
+    return maze
+
+
+def test_stream_generate(tmp_path: Path) -> None:
+    maze = stream_maze(tmp_path)
+    with pytest.raises(ValueError, match="write_stream"):
+        maze.generate()
+
+
+def test_stream_write(tmp_path: Path) -> None:
+    maze = stream_maze(tmp_path)
+    with pytest.raises(ValueError, match="write_stream"):
+        maze.write()
+    assert not (tmp_path / "maze.txt").exists()
+
+
+def test_stream_generate_many(tmp_path: Path) -> None:
+    maze = stream_maze(tmp_path)
+    with pytest.raises(ValueError, match="write_stream"):
+        maze.generate_many([1, 2], workers=1)
+    with pytest.raises(ValueError, match="write_stream"):
+        maze.write_many([1, 2], workers=1)
+
+
+def test_stream_write_stream(tmp_path: Path) -> None:
+    maze = stream_maze(tmp_path)
+    maze.write_stream()
+    lines = (tmp_path / "maze.txt").read_text().splitlines()
+    assert len(lines[0]) == 20
+    assert lines[16:18] == ["0, 0", "19, 14"]
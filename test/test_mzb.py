@@ -0,0 +1,127 @@
+from pathlib import Path
+from random import Random
+
+import pytest
+
+from mazegen import MappedGrid, load_maze
+from mazegen.mzb import encode_mzb, parse_mzb
+from mazegen.writer import write_maze
+
+# Odd and even cell counts, single rows and columns
+SIZES = [(1, 1), (1, 2), (3, 1), (3, 5), (4, 4), (5, 3), (7, 9), (8, 3)]
+
+
+def random_cells(width: int, height: int, seed: int = 0) -> bytearray:
+    rng = Random(seed)
+    return bytearray(rng.randrange(16) for _ in range(width * height))
+
+
+def random_path(steps: int, seed: int = 0) -> str:
+    rng = Random(seed)
+    return "".join(rng.choice("NESW") for _ in range(steps))
+
+
+def write_file(
+    tmp_path: Path,
+    binary: bool,
+    cells: bytearray,
+    width: int,
+    height: int,
+    path: str | None,
+) -> Path:
+    entry, exit = (0, 0), (width - 1, height - 1)
+    if binary:
+        file = tmp_path / "maze.mzb"
+        file.write_bytes(
+            encode_mzb(cells, width, height, entry, exit, path=path)
+        )
+    else:
+        file = tmp_path / "maze.txt"
+        rows = (cells[i:i + width] for i in range(0, len(cells), width))
+        write_maze(file, rows, entry, exit, path)
+    return file
+
+
+@pytest.mark.parametrize("width, height", SIZES)
+@pytest.mark.parametrize("steps", range(10))
+def test_mzb_round_trip(width: int, height: int, steps: int) -> None:
+    cells = random_cells(width, height, steps)
+    path = random_path(steps, width * height)
+    data = encode_mzb(
+        cells, width, height, (0, 0), (width - 1, height - 1),
+        seed=steps, algorithm="hak", perfect=bool(steps % 2), path=path,
+    )
+    assert len(data) == 64 + (width * height + 1) // 2 + (steps + 3) // 4
+    maze = parse_mzb(data)
+    assert maze["cells"] == cells
+    assert (maze["width"], maze["height"]) == (width, height)
+    assert maze["entry"] == (0, 0)
+    assert maze["exit"] == (width - 1, height - 1)
+    assert maze["path"] == path
+    assert maze["seed"] == steps
+    assert maze["algorithm"] == "hak"
+    assert maze["perfect"] == bool(steps % 2)
+
+
+def test_mzb_optional_fields() -> None:
+    maze = parse_mzb(encode_mzb(random_cells(3, 5), 3, 5))
+    assert maze["cells"] == random_cells(3, 5)
+    assert maze["entry"] is None and maze["exit"] is None
+    assert maze["path"] is None and maze["seed"] is None
+    assert maze["algorithm"] is None and maze["perfect"] is False
+
+
+def test_mzb_rejects_bad_data() -> None:
+    data = encode_mzb(random_cells(3, 5), 3, 5, path="NESWN")
+    with pytest.raises(ValueError):
+        parse_mzb(data[:-1])
+    with pytest.raises(ValueError):
+        parse_mzb(data[:63])
+    with pytest.raises(ValueError):
+        parse_mzb(b"MZB2" + data[4:])
+    with pytest.raises(ValueError):
+        encode_mzb(random_cells(3, 5), 5, 5)
+
+
+@pytest.mark.parametrize("binary", [True, False], ids=["mzb", "text"])
+@pytest.mark.parametrize("width, height", SIZES)
+def test_mapped_grid(
+    tmp_path: Path, binary: bool, width: int, height: int
+) -> None:
+    cells = random_cells(width, height)
+    path = random_path(width + height)
+    file = write_file(tmp_path, binary, cells, width, height, path)
+    count = width * height
+
+    assert load_maze(file)["cells"] == cells
+    with MappedGrid(file) as grid:
+        assert grid.binary == binary
+        assert (grid.width, grid.height) == (width, height)
+        assert grid.entry == (0, 0)
+        assert grid.exit == (width - 1, height - 1)
+        assert grid.path == path
+        assert len(grid) == count
+        assert [grid[i] for i in range(count)] == list(cells)
+        assert grid[-1] == cells[-1]
+        # Every slice, starting and ending on odd and even cells
+        for start in range(count + 1):
+            for stop in range(start, count + 2):
+                assert grid[start:stop] == bytes(cells[start:stop])
+        assert grid[:] == bytes(cells)
+        assert list(grid.rows()) == [
+            bytes(cells[i:i + width]) for i in range(0, count, width)
+        ]
+        with pytest.raises(ValueError):
+            grid[::2]
+
+
+@pytest.mark.parametrize("steps", range(10))
+def test_mapped_grid_path(tmp_path: Path, steps: int) -> None:
+    cells = random_cells(5, 3)
+    path = random_path(steps, steps)
+    for binary in (True, False):
+        file = write_file(tmp_path, binary, cells, 5, 3, path)
+        with MappedGrid(file) as grid:
+            # The text format cannot tell an empty path from no path
+            assert grid.path == (path if binary else path or None)
+            assert grid[1:14] == bytes(cells[1:14])
@@ -0,0 +1,61 @@
+from pathfinder import DistanceIndex, PathFinder
+
+N, E, S, W = 1, 2, 4, 8
+STEP = {N: (0, -1, S), E: (1, 0, W), S: (0, 1, N), W: (-1, 0, E)}
+
+
+def make_finder(
+    width: int, height: int, passages: list[tuple[int, int, int]]
+) -> PathFinder:
+    """Pathfinder over a closed grid with the given passages opened."""
+    cells = bytearray([15]) * (width * height)
+    for x, y, wall in passages:
+        dx, dy, opposite = STEP[wall]
+        cells[y * width + x] &= ~wall
+        cells[(y + dy) * width + x + dx] &= ~opposite
+    finder = PathFinder()
+    finder.cells = cells
+    finder.width = width
+    finder.height = height
+    return finder
+
+
+def loop_and_island() -> PathFinder:
+    """4x4 maze: a six-cell loop with the entry and a separate corridor.
+
+    Passages equal cells minus one over the whole grid, yet the maze is
+    not a tree.
+    """
+    finder = make_finder(4, 4, [
+        (0, 0, E), (1, 0, E), (2, 0, S), (2, 1, W), (1, 1, W), (0, 1, N),
+        (0, 3, E), (1, 3, E),
+    ])
+    finder.entry = (0, 0)
+    finder.exit = (2, 0)
+    return finder
+
+
+def test_loop_with_separate_component_is_not_perfect() -> None:
+    finder = loop_and_island()
+    assert not finder.is_perfect()
+    for strategy in ("auto", "tree", "bfs", "astar", "bidirectional"):
+        assert finder.find_path(strategy) == "EE"
+
+
+def test_distance_index_outside_entry_component() -> None:
+    index = DistanceIndex(loop_and_island())
+    assert not index.tree
+    assert index.distance((0, 0), (2, 0)) == 2
+    assert index.distance((0, 3), (2, 3)) == 2
+    assert index.path((0, 3), (2, 3)) == "EE"
+
+
+def test_distance_index_same_cell() -> None:
+    tree = make_finder(3, 1, [(0, 0, E)])
+    for finder in (tree, loop_and_island()):
+        index = DistanceIndex(finder)
+        assert index.distance((0, 0), (0, 0)) == 0
+        assert index.path((0, 0), (0, 0)) == ""
+        blocked = (2, 0) if finder is tree else (3, 3)
+        assert index.distance(blocked, blocked) is None
+        assert index.path(blocked, blocked) is None